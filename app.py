@@ -166,6 +166,10 @@ NagSuppressions.add_stack_suppressions(
                 "Resource::arn:aws:logs:<AWS::Region>:<AWS::AccountId>:log-group:/aws/sagemaker/Endpoints/protein-agent-*:*",  # Access limited to only endpoint logs
             ],
         },
+        {
+            "id": "AwsSolutions-SNS2",
+            "reason": "Async inference notification topics carry only inference IDs and S3 locations, not payloads. Messages are encrypted at rest in the subscribed SQS queue.",
+        },
     ],
 )
 
@@ -30,9 +30,11 @@ Usage:
 
 import argparse
 import boto3
+import functools
 import json
 import logging
 import os
+import re
 import sys
 
 from typing import Dict, Any, Optional
@@ -46,6 +48,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# AgentCore gateway names: alphanumerics separated by single hyphens, max 100 chars
+GATEWAY_NAME_PATTERN = re.compile(r"^([0-9a-zA-Z][-]?){1,100}$")
+
+# OAuth scopes requested for gateway access tokens
+GATEWAY_TOKEN_SCOPE = (
+    "agentcore-gateway-id/gateway:read agentcore-gateway-id/gateway:write"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _cognito_token_url(user_pool_id: str, region: str) -> str:
+    """Build the Cognito OAuth2 token endpoint URL for a user pool."""
+    return f"https://{user_pool_id.replace('_', '')}.auth.{region}.amazoncognito.com/oauth2/token"
+
 
 class AgentCoreGatewayDeployer:
     """Handles deployment of Amazon Bedrock AgentCore Gateway."""
@@ -169,6 +185,21 @@ class AgentCoreGatewayDeployer:
         use_existing: bool = False,
     ) -> Dict[str, Any]:
         """Create the AgentCore Gateway with Cognito JWT authorization."""
+        if not GATEWAY_NAME_PATTERN.match(gateway_name):
+            logger.error(
+                f"Invalid gateway name '{gateway_name}'. Use letters, digits and single hyphens (max 100 characters)."
+            )
+            sys.exit(1)
+
+        # Look up an existing gateway first so reuse needs no create round trip
+        if use_existing:
+            existing = self._find_gateway(gateway_name)
+            if existing:
+                logger.info(
+                    f"Gateway '{gateway_name}' already exists, using existing gateway"
+                )
+                return self._get_existing_gateway(existing)
+
         logger.info(f"Creating AgentCore Gateway: {gateway_name}")
 
         # Configure JWT authorizer with Cognito
@@ -211,15 +242,9 @@ class AgentCoreGatewayDeployer:
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             if error_code == "ConflictException":
-                if use_existing:
-                    logger.info(
-                        f"Gateway '{gateway_name}' already exists, using existing gateway"
-                    )
-                    return self._get_existing_gateway(gateway_name)
-                else:
-                    logger.error(
-                        f"Gateway with name '{gateway_name}' already exists. Use --use-existing to use the existing gateway."
-                    )
+                logger.error(
+                    f"Gateway with name '{gateway_name}' already exists. Use --use-existing to use the existing gateway."
+                )
             elif error_code == "ValidationException":
                 logger.error(f"Invalid gateway configuration: {e}")
             else:
@@ -229,40 +254,40 @@ class AgentCoreGatewayDeployer:
             logger.error(f"Unexpected error creating gateway: {e}")
             sys.exit(1)
 
-    def _get_existing_gateway(self, gateway_name: str) -> Dict[str, Any]:
-        """Get information about an existing gateway."""
+    def _find_gateway(self, gateway_name: str) -> Optional[Dict[str, Any]]:
+        """Find a gateway summary by name across all pages of list_gateways."""
         try:
-            # List gateways to find the one with matching name
-            response = self.agentcore_client.list_gateways()
-
-            for gateway in response.get("items", []):
-                if gateway["name"] == gateway_name:
-                    gateway_id = gateway["gatewayId"]
+            paginator = self.agentcore_client.get_paginator("list_gateways")
+            return next(
+                paginator.paginate().search(
+                    f"items[?name=='{gateway_name}'][]"
+                ),
+                None,
+            )
+        except Exception as e:
+            logger.error(f"Error listing existing gateways: {e}")
+            sys.exit(1)
 
-                    # Get detailed gateway information to get the URL
-                    gateway_details = self.agentcore_client.get_gateway(
-                        gatewayIdentifier=gateway_id
-                    )
-                    gateway_url = gateway_details["gatewayUrl"]
+    def _get_existing_gateway(self, gateway: Dict[str, Any]) -> Dict[str, Any]:
+        """Get information about an existing gateway."""
+        try:
+            gateway_id = gateway["gatewayId"]
 
-                    logger.info(f"Found existing gateway:")
-                    logger.info(f"  Gateway ID: {gateway_id}")
-                    logger.info(f"  Gateway URL: {gateway_url}")
+            # Get detailed gateway information to get the URL
+            gateway_details = self.agentcore_client.get_gateway(
+                gatewayIdentifier=gateway_id
+            )
+            gateway_url = gateway_details["gatewayUrl"]
 
-                    return {
-                        "gateway_id": gateway_id,
-                        "gateway_url": gateway_url,
-                        "response": gateway_details,
-                    }
+            logger.info(f"Found existing gateway:")
+            logger.info(f"  Gateway ID: {gateway_id}")
+            logger.info(f"  Gateway URL: {gateway_url}")
 
-            # If we get here, the gateway wasn't found in the list
-            logger.error(
-                f"Gateway '{gateway_name}' exists but couldn't be found in gateway list"
-            )
-            logger.error(
-                f"Available gateways: {[g['name'] for g in response.get('items', [])]}"
-            )
-            sys.exit(1)
+            return {
+                "gateway_id": gateway_id,
+                "gateway_url": gateway_url,
+                "response": gateway_details,
+            }
 
         except Exception as e:
             logger.error(f"Error retrieving existing gateway information: {e}")
@@ -273,12 +298,8 @@ class AgentCoreGatewayDeployer:
         logger.info("Requesting access token from Cognito...")
 
         try:
-            # Use user pool ID directly from SSM Parameter Store
-            user_pool_id = cognito_config["user_pool_id"]
-
-            # Build token endpoint URL
-            user_pool_id_without_underscore = user_pool_id.replace("_", "")
-            token_url = f"https://{user_pool_id_without_underscore}.auth.{self.region}.amazoncognito.com/oauth2/token"
+            # Build token endpoint URL from the user pool ID in SSM Parameter Store
+            token_url = _cognito_token_url(cognito_config["user_pool_id"], self.region)
 
             # Prepare token request
             import requests
@@ -288,7 +309,7 @@ class AgentCoreGatewayDeployer:
                 "grant_type": "client_credentials",
                 "client_id": cognito_config["client_id"],
                 "client_secret": cognito_config["client_secret"],
-                "scope": "agentcore-gateway-id/gateway:read agentcore-gateway-id/gateway:write",
+                "scope": GATEWAY_TOKEN_SCOPE,
             }
 
             response = requests.post(token_url, headers=headers, data=data, timeout=5)
@@ -13,6 +13,8 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+__all__ = ["AgentCoreGatewayStack"]
+
 
 class AgentCoreGatewayStack(Stack):
     """CDK Stack that creates the IAM role for AgentCore Gateway."""
@@ -26,6 +28,10 @@ class AgentCoreGatewayStack(Stack):
         # Store the role ARN in SSM Parameter Store
         self._store_role_arn()
 
+        # Only deploy-time SSM lookups couple this stack to others, so CI
+        # wrappers may deploy it with --concurrency once its dependencies exist
+        cdk.Tags.of(self).add("cdk-concurrency-safe", "true")
+
         # Output the role ARN
         cdk.CfnOutput(
             self,
@@ -39,9 +45,9 @@ class AgentCoreGatewayStack(Stack):
         """Create the IAM role for AgentCore Gateway."""
 
         # Retrieve the Lambda function ARN from SSM Parameter Store
-        lambda_function_arn = ssm.StringParameter.value_for_string_parameter(
-            self, "/sagemaker-async/lambda-function-arn"
-        )
+        lambda_function_arn = self._resolve_ssm_params(
+            ["/sagemaker-async/lambda-function-arn"]
+        )["/sagemaker-async/lambda-function-arn"]
 
         # Create the role with basic service principal first
         role = iam.Role(
@@ -86,6 +92,14 @@ class AgentCoreGatewayStack(Stack):
 
         return role
 
+    def _resolve_ssm_params(self, names: list[str]) -> dict[str, str]:
+        """Resolve SSM string parameters for this stack, keyed by parameter name."""
+        # CDK reuses the parameter construct for a repeated name within a stack
+        return {
+            name: ssm.StringParameter.value_for_string_parameter(self, name)
+            for name in names
+        }
+
     def _store_role_arn(self) -> None:
         """Store the role ARN in SSM Parameter Store."""
         ssm.StringParameter(
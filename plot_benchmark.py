@@ -7,12 +7,25 @@ This script reads the CSV output from benchmark.py and creates a dot plot
 showing the relationship between sequence length and processing time.
 """
 
+import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import argparse
 import sys
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401
+
+    CSV_ENGINE = "pyarrow"  # Multithreaded parser, used when pyarrow is installed
+except ImportError:
+    CSV_ENGINE = "c"
+
+# Only the columns that are plotted or summarized are loaded from the CSV
+CSV_COLUMNS = ["status", "sequence_length", "total_time"]
+CSV_DTYPES = {"status": "category", "sequence_length": "int32", "total_time": "float32"}
+
 
 def plot_benchmark_results(csv_file: str, output_file: str = None):
     """
@@ -24,72 +37,79 @@ def plot_benchmark_results(csv_file: str, output_file: str = None):
     """
     try:
         # Read the CSV file
-        df = pd.read_csv(csv_file)
+        df = pd.read_csv(csv_file, engine=CSV_ENGINE, usecols=CSV_COLUMNS, dtype=CSV_DTYPES)
         
         # Filter only completed tests
-        completed_df = df[df['status'] == 'completed'].copy()
+        completed_df = df[df['status'] == 'completed']
         
         if completed_df.empty:
             print("❌ No completed tests found in the CSV file")
             return
         
         # Convert total_time from seconds to minutes
-        completed_df['total_time_minutes'] = completed_df['total_time'] / 60
+        completed_df = completed_df.assign(total_time_minutes=completed_df['total_time'] / 60)
+        
+        # Summary statistics for both columns in a single pass
+        stats = completed_df[['sequence_length', 'total_time_minutes']].agg(['min', 'max', 'mean', 'std'])
+        min_length = int(stats.at['min', 'sequence_length'])
+        max_length = int(stats.at['max', 'sequence_length'])
+        min_time = stats.at['min', 'total_time_minutes']
+        max_time = stats.at['max', 'total_time_minutes']
         
         # Create the plot
-        plt.figure(figsize=(10, 6))
+        fig, ax = plt.subplots(figsize=(10, 6))
         
         # Create dot plot
-        plt.scatter(completed_df['sequence_length'], completed_df['total_time_minutes'], 
+        ax.scatter(completed_df['sequence_length'], completed_df['total_time_minutes'], 
                    color='blue', s=60, alpha=0.7, edgecolors='darkblue', linewidth=1)
         
         # Customize the plot
-        plt.xlabel('Sequence Length (amino acids)', fontsize=12)
-        plt.ylabel('Total Time (minutes)', fontsize=12)
-        plt.title('SageMaker Lambda Performance: Processing Time vs Sequence Length', fontsize=14, pad=20)
-        plt.grid(True, alpha=0.3)
+        ax.set_xlabel('Sequence Length (amino acids)', fontsize=12)
+        ax.set_ylabel('Total Time (minutes)', fontsize=12)
+        ax.set_title('SageMaker Lambda Performance: Processing Time vs Sequence Length', fontsize=14, pad=20)
+        ax.grid(True, alpha=0.3)
         
         # Format x-axis to show comma-separated numbers
-        ax = plt.gca()
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
+        ax.xaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(lambda x, p: f'{int(x):,}'))
         
         # Add some styling
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Add trend line if we have enough points
         if len(completed_df) > 2:
-            z = np.polyfit(completed_df['sequence_length'], completed_df['total_time_minutes'], 1)
-            p = np.poly1d(z)
-            plt.plot(completed_df['sequence_length'], p(completed_df['sequence_length']), 
-                    "r--", alpha=0.8, linewidth=2, label=f'Trend line (slope: {z[0]:.4f} min/aa)')
-            plt.legend()
+            x = completed_df['sequence_length'].to_numpy()
+            y = completed_df['total_time_minutes'].to_numpy()
+            slope, intercept = np.polyfit(x, y, 1)
+            # A straight line only needs its two end points
+            xs = np.array([x.min(), x.max()])
+            ax.plot(xs, slope * xs + intercept, 
+                    "r--", alpha=0.8, linewidth=2, label=f'Trend line (slope: {slope:.4f} min/aa)')
+            ax.legend()
         
         # Show some statistics on the plot
-        max_time = completed_df['total_time_minutes'].max()
-        max_length = completed_df['sequence_length'].max()
-        
         stats_text = f"Max time: {max_time:.1f} min\nMax length: {max_length:,} aa\nCompleted tests: {len(completed_df)}"
-        plt.text(0.02, 0.98, stats_text, transform=ax.transAxes, fontsize=10,
+        ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, fontsize=10,
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
         
         # Save or show the plot
         if output_file:
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
+            fig.savefig(output_file, dpi=300, bbox_inches='tight')
             print(f"📊 Plot saved to: {output_file}")
         else:
             plt.show()
+        plt.close(fig)
         
         # Print summary statistics
         print("\n📈 Benchmark Summary:")
         print(f"   Completed tests: {len(completed_df)}")
-        print(f"   Sequence length range: {completed_df['sequence_length'].min():,} - {completed_df['sequence_length'].max():,} amino acids")
-        print(f"   Processing time range: {completed_df['total_time_minutes'].min():.1f} - {completed_df['total_time_minutes'].max():.1f} minutes")
-        print(f"   Average processing time: {completed_df['total_time_minutes'].mean():.1f} minutes")
+        print(f"   Sequence length range: {min_length:,} - {max_length:,} amino acids")
+        print(f"   Processing time range: {min_time:.1f} - {max_time:.1f} minutes")
+        print(f"   Average processing time: {stats.at['mean', 'total_time_minutes']:.1f} minutes")
         
         if len(completed_df) > 1:
             # Calculate scaling characteristics
-            time_per_aa = completed_df['total_time_minutes'] / completed_df['sequence_length']
-            print(f"   Time per amino acid: {time_per_aa.mean():.6f} ± {time_per_aa.std():.6f} minutes/aa")
+            time_per_aa = (completed_df['total_time_minutes'] / completed_df['sequence_length']).agg(['mean', 'std'])
+            print(f"   Time per amino acid: {time_per_aa['mean']:.6f} ± {time_per_aa['std']:.6f} minutes/aa")
         
     except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_file}")
@@ -100,12 +120,13 @@ def plot_benchmark_results(csv_file: str, output_file: str = None):
 
 def find_latest_benchmark_csv():
     """Find the most recent benchmark CSV file in the current directory."""
-    csv_files = list(Path('.').glob('benchmark_*.csv'))
+    # benchmark_YYYYMMDD_HHMMSS.csv names sort chronologically as strings,
+    # so no per-file stat() call is needed
+    csv_files = sorted(Path('.').glob('benchmark_*.csv'))
     if not csv_files:
         return None
     
-    # Sort by modification time and return the most recent
-    return str(sorted(csv_files, key=lambda x: x.stat().st_mtime)[-1])
+    return str(csv_files[-1])
 
 
 def main():
@@ -149,6 +170,10 @@ Examples:
         print(f"❌ File not found: {csv_file}")
         return 1
     
+    # Saving to a file needs no GUI toolkit, so use the non-interactive Agg backend
+    if args.output:
+        matplotlib.use("Agg")
+    
     # Create the plot
     plot_benchmark_results(csv_file, args.output)
     
@@ -156,5 +181,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    import numpy as np  # Import here to avoid dependency issues if not installed
     sys.exit(main())
\ No newline at end of file
@@ -14,32 +14,54 @@ import boto3
 import json
 import base64
 import time
+import random
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import sys
 import csv
+import functools
 from typing import Dict, Any, List, Optional
+from botocore.config import Config
 
-lambda_client = boto3.client("lambda")
+# Created in main() once the requested concurrency is known
+lambda_client = None
+
+# Initial polling delay in seconds, doubled on each attempt up to poll_interval
+POLL_BACKOFF_BASE = 2
+
+# Columns written to the benchmark CSV, including flattened results summary fields
+CSV_FIELDNAMES = [
+    "copies", "sequence_length", "status", "invoke_time", "poll_time", 
+    "total_time", "completion_time", "attempts", "error", "heatmap_dimensions", "outlier_count",
+    "concurrency", "notes"
+]
+
+# CSV note for rows measured with several jobs in flight at once
+QUEUEING_NOTE = "total_time includes endpoint queueing; {concurrency} jobs ran concurrently"
 
 # Base sequence to concatenate for testing (100 amino acids)
 BASE_SEQUENCE = "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAEDLQVGQVELGGGPGAGSLQPLALEGSLQKRGIVEQCCTSIC"
 
+# Base64-encoded client context per tool name (simulated for direct Lambda invocation)
+_CLIENT_CONTEXT = {
+    tool_name: base64.b64encode(
+        json.dumps({"custom": {"bedrockagentcoreToolName": tool_name}}).encode()
+    ).decode()
+    for tool_name in ("invoke_endpoint", "get_results")
+}
+
 
 def invoke_lambda_tool(function_name: str, tool_name: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
     """Helper function to invoke Lambda with proper context setup."""
     # Add tool name to event
     event_data["tool_name"] = tool_name
 
-    # Context with tool name (simulated for direct Lambda invocation)
-    context_custom = {"bedrockagentcoreToolName": tool_name}
-
     response = lambda_client.invoke(
         FunctionName=function_name,
         Payload=json.dumps(event_data),
-        ClientContext=base64.b64encode(
-            json.dumps({"custom": context_custom}).encode()
-        ).decode(),
+        ClientContext=_CLIENT_CONTEXT[tool_name],
     )
 
     return json.loads(response["Payload"].read())
@@ -52,43 +74,37 @@ def print_separator(title: str) -> None:
     print(f"{'='*80}")
 
 
+@functools.lru_cache(maxsize=None)
 def generate_test_sequence(copies: int) -> str:
     """Generate test sequence by concatenating base sequence."""
     return BASE_SEQUENCE * copies
 
 
-def run_single_benchmark(
-    function_name: str, 
-    copies: int, 
-    max_attempts: int = 30, 
-    poll_interval: int = 15
-) -> Dict[str, Any]:
+def submit_invoke(function_name: str, copies: int) -> Dict[str, Any]:
     """
-    Run a single benchmark test with specified sequence length.
-    
+    Submit a single benchmark job with specified sequence length.
+
     Args:
         function_name: Lambda function name
         copies: Number of times to concatenate base sequence
-        max_attempts: Maximum polling attempts
-        poll_interval: Polling interval in seconds
-        
+
     Returns:
-        Dictionary with benchmark results
+        Dictionary with submission state, or final results if the invoke failed
     """
     sequence = generate_test_sequence(copies)
     sequence_length = len(sequence)
-    
+
     print(f"\n🧬 Testing with {copies} copies ({sequence_length:,} amino acids)")
-    
+
     # Record start time
     start_time = time.time()
-    
+
     # Step 1: Invoke endpoint
     invoke_event = {"sequence": sequence}
-    
+
     try:
         invoke_result = invoke_lambda_tool(function_name, "invoke_endpoint", invoke_event)
-        
+
         if not invoke_result.get("success") or "data" not in invoke_result:
             return {
                 "copies": copies,
@@ -99,18 +115,83 @@ def run_single_benchmark(
                 "total_time": None,
                 "completion_time": None
             }
-        
+
         output_id = invoke_result["data"]["output_id"]
         invoke_time = time.time() - start_time
-        
-        print(f"✅ Endpoint invoked successfully in {invoke_time:.2f}s")
-        print(f"🆔 Output ID: {output_id}")
-        
+
+        print(f"✅ [{copies}] Endpoint invoked successfully in {invoke_time:.2f}s")
+        print(f"🆔 [{copies}] Output ID: {output_id}")
+
+        return {
+            "copies": copies,
+            "sequence_length": sequence_length,
+            "status": "submitted",
+            "output_id": output_id,
+            "start_time": start_time,
+            "invoke_time": invoke_time,
+        }
+
+    except Exception as e:
+        total_time = time.time() - start_time
+        return {
+            "copies": copies,
+            "sequence_length": sequence_length,
+            "status": "error",
+            "error": str(e),
+            "invoke_time": None,
+            "total_time": total_time,
+            "completion_time": None
+        }
+
+
+def await_completion(
+    function_name: str,
+    submission: Dict[str, Any],
+    max_attempts: int = 30,
+    poll_interval: int = 15,
+    stop_event: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """
+    Poll for the results of a submitted benchmark job.
+
+    Args:
+        function_name: Lambda function name
+        submission: State returned by submit_invoke
+        max_attempts: Maximum polling attempts; together with poll_interval
+            this sets the polling time budget (max_attempts * poll_interval)
+        poll_interval: Maximum delay between polls in seconds
+        stop_event: Optional event that aborts polling when set
+
+    Returns:
+        Dictionary with benchmark results
+    """
+    if submission["status"] != "submitted":
+        return submission
+
+    copies = submission["copies"]
+    sequence_length = submission["sequence_length"]
+    output_id = submission["output_id"]
+    start_time = submission["start_time"]
+    invoke_time = submission["invoke_time"]
+
+    try:
         # Step 2: Poll for results
         poll_start_time = time.time()
+        deadline = time.monotonic() + max_attempts * poll_interval
         attempt = 1
         
-        while attempt <= max_attempts:
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return {
+                    "copies": copies,
+                    "sequence_length": sequence_length,
+                    "status": "cancelled",
+                    "invoke_time": invoke_time,
+                    "total_time": None,
+                    "completion_time": None,
+                    "attempts": attempt - 1
+                }
+
             results_event = {"output_id": output_id}
             results_response = invoke_lambda_tool(function_name, "get_results", results_event)
             
@@ -123,7 +204,7 @@ def run_single_benchmark(
                     poll_time = time.time() - poll_start_time
                     completion_time = data.get("completion_time")
                     
-                    print(f"🎉 Completed in {total_time:.2f}s (polling: {poll_time:.2f}s)")
+                    print(f"🎉 [{copies}] Completed in {total_time:.2f}s (polling: {poll_time:.2f}s)")
                     
                     return {
                         "copies": copies,
@@ -155,11 +236,15 @@ def run_single_benchmark(
                 elif status == "in_progress":
                     if attempt % 5 == 0:  # Print progress every 5 attempts
                         elapsed = time.time() - start_time
-                        print(f"⏳ Still processing... ({elapsed:.0f}s elapsed, attempt {attempt})")
+                        print(f"⏳ [{copies}] Still processing... ({elapsed:.0f}s elapsed, attempt {attempt})")
             
-            # Wait before next attempt
-            if attempt < max_attempts:
-                time.sleep(poll_interval)
+            # Wait before next attempt: exponential backoff with jitter,
+            # capped at poll_interval and never past the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            delay = min(poll_interval, POLL_BACKOFF_BASE * 2 ** min(attempt - 1, 6))
+            time.sleep(min(remaining, delay * random.uniform(0.8, 1.2)))
             
             attempt += 1
         
@@ -169,11 +254,11 @@ def run_single_benchmark(
             "copies": copies,
             "sequence_length": sequence_length,
             "status": "timeout",
-            "error": f"Timeout after {max_attempts} attempts",
+            "error": f"Timeout after {attempt} attempts ({time.time() - poll_start_time:.0f}s)",
             "invoke_time": invoke_time,
             "total_time": total_time,
             "completion_time": None,
-            "attempts": max_attempts
+            "attempts": attempt
         }
         
     except Exception as e:
@@ -183,12 +268,40 @@ def run_single_benchmark(
             "sequence_length": sequence_length,
             "status": "error",
             "error": str(e),
-            "invoke_time": None,
+            "invoke_time": invoke_time,
             "total_time": total_time,
             "completion_time": None
         }
 
 
+def run_single_benchmark(
+    function_name: str, 
+    copies: int, 
+    max_attempts: int = 30, 
+    poll_interval: int = 15,
+    stop_event: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """
+    Run a single benchmark test with specified sequence length.
+    
+    Args:
+        function_name: Lambda function name
+        copies: Number of times to concatenate base sequence
+        max_attempts: Maximum polling attempts (sets the polling time budget)
+        poll_interval: Maximum delay between polls in seconds
+        stop_event: Optional event that skips or aborts the test when set
+        
+    Returns:
+        Dictionary with benchmark results
+    """
+    if stop_event is not None and stop_event.is_set():
+        return {"copies": copies, "status": "cancelled"}
+    submission = submit_invoke(function_name, copies)
+    return await_completion(
+        function_name, submission, max_attempts, poll_interval, stop_event
+    )
+
+
 def _extract_results_summary(results: Dict[str, Any]) -> Dict[str, Any]:
     """Extract summary information from results."""
     summary = {}
@@ -206,38 +319,6 @@ def _extract_results_summary(results: Dict[str, Any]) -> Dict[str, Any]:
     return summary
 
 
-def save_results_to_csv(results: List[Dict[str, Any]], filename: str) -> None:
-    """Save benchmark results to CSV file."""
-    if not results:
-        return
-    
-    fieldnames = [
-        "copies", "sequence_length", "status", "invoke_time", "poll_time", 
-        "total_time", "completion_time", "attempts", "error", "heatmap_dimensions", "outlier_count"
-    ]
-    
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for result in results:
-            row = result.copy()
-            
-            # Flatten results_summary
-            if "results_summary" in row:
-                summary = row.pop("results_summary")
-                row.update(summary)
-            
-            # Ensure all fields are present
-            for field in fieldnames:
-                if field not in row:
-                    row[field] = None
-            
-            writer.writerow(row)
-    
-    print(f"📊 Results saved to: {filename}")
-
-
 def print_summary_table(results: List[Dict[str, Any]]) -> None:
     """Print a summary table of benchmark results."""
     print_separator("BENCHMARK SUMMARY")
@@ -253,7 +334,7 @@ def print_summary_table(results: List[Dict[str, Any]]) -> None:
         invoke_time = f"{result['invoke_time']:.1f}s" if result.get("invoke_time") else "N/A"
         total_time = f"{result['total_time']:.1f}s" if result.get("total_time") else "N/A"
         
-        outliers = result.get("results_summary", {}).get("outlier_count", "N/A")
+        outliers = result.get("outlier_count", "N/A")
         outliers_str = str(outliers) if outliers != "N/A" else "N/A"
         
         print(f"{copies:<8} {length:<10} {status:<12} {invoke_time:<8} {total_time:<8} {outliers_str:<10}")
@@ -292,14 +373,25 @@ Examples:
         "--max-attempts",
         type=int,
         default=30,
-        help="Maximum polling attempts per test (default: 30)"
+        help="Maximum polling attempts per test; polling stops after max-attempts x poll-interval seconds (default: 30)"
     )
 
     parser.add_argument(
         "--poll-interval",
         type=int,
         default=15,
-        help="Polling interval in seconds (default: 15)"
+        help="Maximum polling interval in seconds; polls back off exponentially up to this value (default: 15)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help=(
+            "Number of tests in flight at once (default: 1, one after another). "
+            "Above 1, jobs share the endpoint's queue and GPU, so total_time "
+            "includes queueing time rather than processing time alone"
+        )
     )
 
     parser.add_argument(
@@ -316,14 +408,33 @@ Examples:
     return parser.parse_args()
 
 
+def create_lambda_client(concurrency: int):
+    """Create a Lambda client sized for concurrent invokes, with adaptive retries."""
+    return boto3.client(
+        "lambda",
+        config=Config(
+            max_pool_connections=max(50, 2 * concurrency),
+            retries={"mode": "adaptive", "max_attempts": 10},
+            tcp_keepalive=True,
+        ),
+    )
+
+
 def main():
+    global lambda_client
+
     args = parse_args()
+    concurrency = max(1, args.concurrency)
+    lambda_client = create_lambda_client(concurrency)
 
     print("🧬 SageMaker Async Inference Lambda Benchmark Tool")
     print(f"🔧 Lambda function: {args.function_name}")
     print(f"📏 Base sequence length: {len(BASE_SEQUENCE)} amino acids")
     print(f"🔢 Testing {args.start_copies} to {args.max_copies} copies")
     print(f"📊 Total sequence lengths: {args.start_copies * len(BASE_SEQUENCE):,} to {args.max_copies * len(BASE_SEQUENCE):,} amino acids")
+    print(f"🚦 Concurrency: {concurrency}")
+    if concurrency > 1:
+        print("⚠️  Concurrent tests queue at the endpoint; total_time includes queueing time")
 
     # Verify the function exists
     try:
@@ -346,34 +457,70 @@ def main():
     print_separator("STARTING BENCHMARK")
 
     results = []
-    
-    for copies in range(args.start_copies, args.max_copies + 1):
-        try:
-            result = run_single_benchmark(
-                args.function_name, 
-                copies, 
-                args.max_attempts, 
-                args.poll_interval
+    copies_range = range(args.start_copies, args.max_copies + 1)
+    stop_event = threading.Event()
+
+    # Rows are written as each test finishes so partial results survive interruption
+    csvfile = open(output_file, 'w', newline='')
+    writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+    writer.writeheader()
+
+    # Each worker submits a test and polls it to completion, so at most
+    # `concurrency` jobs are on the endpoint at once; the default of 1 keeps
+    # total_time free of queueing behind other tests
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = [
+            executor.submit(
+                run_single_benchmark,
+                args.function_name,
+                copies,
+                args.max_attempts,
+                args.poll_interval,
+                stop_event,
             )
+            for copies in copies_range
+        ]
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"\n💥 Unexpected error during benchmark: {e}")
+                if not args.continue_on_failure:
+                    stop_event.set()
+                continue
+
+            if result["status"] == "cancelled":
+                continue
+
+            # Flatten results_summary into the row and persist it immediately
+            result.update(result.pop("results_summary", {}))
+            result["concurrency"] = concurrency
+            if concurrency > 1:
+                result["notes"] = QUEUEING_NOTE.format(concurrency=concurrency)
+            writer.writerow(result)
+            csvfile.flush()
             results.append(result)
-            
+
             # Check if we should continue on failure
-            if result["status"] in ["failed", "error", "timeout"] and not args.continue_on_failure:
-                print(f"\n❌ Test failed for {copies} copies. Stopping benchmark.")
+            if result["status"] in ["failed", "error", "timeout"] and not args.continue_on_failure and not stop_event.is_set():
+                print(f"\n❌ Test failed for {result['copies']} copies. Stopping benchmark.")
                 print(f"💡 Use --continue-on-failure to continue despite failures")
-                break
-                
-        except KeyboardInterrupt:
-            print(f"\n⏹️  Benchmark interrupted by user")
-            break
-        except Exception as e:
-            print(f"\n💥 Unexpected error during benchmark: {e}")
-            if not args.continue_on_failure:
-                break
+                stop_event.set()
+
+    except KeyboardInterrupt:
+        print(f"\n⏹️  Benchmark interrupted by user")
+        stop_event.set()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        csvfile.close()
+
+    results.sort(key=lambda r: r["copies"])
 
-    # Save and display results
+    # Display results
     if results:
-        save_results_to_csv(results, output_file)
+        print(f"📊 Results saved to: {output_file}")
         print_summary_table(results)
         
         # Calculate some statistics
@@ -402,7 +549,7 @@ def main():
                     scaling_factor = (max_time / min_time) / (max_length / min_length)
                     print(f"📊 Scaling factor: {scaling_factor:.2f}x (time increase per length increase)")
     else:
-        print("❌ No results to save")
+        print("❌ No results recorded")
 
     return 0
 
@@ -13,24 +13,113 @@ This script demonstrates how to:
 4. Handle errors and retries
 """
 
+import asyncio
 import boto3
+import concurrent.futures
+import gzip
 import json
+import random
+import statistics
+import struct
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
+import uuid
+from collections import deque
+from typing import Dict, Any, List, Optional, Union
 from urllib.parse import urlparse
 import argparse
 import sys
 
+import numpy as np
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# First delay between result polls in seconds; grows by BACKOFF_FACTOR per poll
+# up to the poll interval
+INITIAL_POLL_DELAY = 0.5
+BACKOFF_FACTOR = 1.8
+
+# A duplicate result GET is sent when the first has not returned within
+# HEDGE_LATENCY_MULTIPLIER x the median observed GET latency
+HEDGE_LATENCY_MULTIPLIER = 2
+DEFAULT_GET_LATENCY = 0.1
+
+# Leading bytes of a gzip stream; the endpoint gzip-compresses its JSON output
+# when asked for application/json+gzip
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Accept type for the endpoint's binary response: a little-endian uint32 header
+# length, a JSON header with shape, dtype and outliers, then the raw heatmap
+HEATMAP_BINARY_CONTENT_TYPE = "application/x-amplify-heatmap"
+
+# SQS long-poll wait per ReceiveMessage call (the service maximum)
+NOTIFICATION_WAIT_SECONDS = 20
+
+# Notifications received for another waiter on this client are held for at most
+# this many seconds, and at most this many at once, before being released
+NOTIFICATION_HOLD_SECONDS = 300
+MAX_HELD_NOTIFICATIONS = 100
+
+# Shared client configuration: room for concurrent polls and hedged GETs,
+# kept-alive connections, and adaptive client-side retry throttling
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+
+# (sagemaker-runtime, s3) clients per region, shared by all SageMakerAsyncClient
+# instances so endpoint and credential resolution happen once per process
+_clients: Dict[str, tuple] = {}
+
+
+def _get_clients(region: str) -> tuple:
+    """Return the cached (sagemaker-runtime, s3) client pair for a region."""
+    if region not in _clients:
+        _clients[region] = (
+            boto3.client("sagemaker-runtime", region_name=region, config=CLIENT_CONFIG),
+            boto3.client("s3", region_name=region, config=CLIENT_CONFIG),
+        )
+    return _clients[region]
+
+
+def _decode_results(body: bytes) -> Dict[str, Any]:
+    """
+    Decode an endpoint response in either JSON or binary heatmap format.
+
+    Args:
+        body: Decompressed result object body
+
+    Returns:
+        Results dictionary; the binary format yields the heatmap as an ndarray
+    """
+    if body[:1] == b"{":
+        return json.loads(body)
+
+    (header_length,) = struct.unpack_from("<I", body)
+    header = json.loads(body[4 : 4 + header_length])
+    heatmap = np.frombuffer(
+        body, dtype=np.dtype(header["dtype"]).newbyteorder("<"), offset=4 + header_length
+    ).reshape(header["shape"])
+    return {"heatmap": heatmap, "outliers": header["outliers"]}
+
 
 class SageMakerAsyncClient:
     """Client for interacting with SageMaker Async Inference endpoints."""
 
-    def __init__(self, endpoint_name: str, bucket_name: str, region: str = "us-east-1"):
+    def __init__(
+        self,
+        endpoint_name: str,
+        bucket_name: str,
+        region: str = "us-east-1",
+        notification_queue_url: Optional[str] = None,
+        binary_output: bool = False,
+    ):
         """
         Initialize the async client.
 
@@ -38,14 +127,35 @@ class SageMakerAsyncClient:
             endpoint_name: Name of the SageMaker endpoint
             bucket_name: S3 bucket name for input/output
             region: AWS region
+            notification_queue_url: SQS queue subscribed to the endpoint's
+                success/error topics; results are polled from S3 if None
+            binary_output: Request the float16 binary heatmap instead of JSON;
+                results then hold the heatmap as a NumPy array
         """
         self.endpoint_name = endpoint_name
         self.bucket_name = bucket_name
         self.region = region
-
-        # Initialize AWS clients
-        self.sagemaker = boto3.client("sagemaker-runtime", region_name=region)
-        self.s3 = boto3.client("s3", region_name=region)
+        self.notification_queue_url = notification_queue_url
+        self.accept = HEATMAP_BINARY_CONTENT_TYPE if binary_output else "application/json"
+
+        # Reuse the process-wide AWS clients for this region
+        self.sagemaker, self.s3 = _get_clients(region)
+        self.sqs = (
+            boto3.client("sqs", region_name=region, config=CLIENT_CONFIG)
+            if notification_queue_url
+            else None
+        )
+
+        # Inference IDs by output location, the IDs this client still expects a
+        # notification for, and notifications received for inferences other
+        # than the one being waited on
+        self._inference_ids: Dict[str, str] = {}
+        self._expected_ids: set = set()
+        self._notifications: Dict[str, tuple] = {}
+        self._notifications_lock = threading.Lock()
+
+        # Recent result GET latencies in seconds, used to time hedged requests
+        self._get_latencies = deque(maxlen=32)
 
     def upload_input(
         self, data: Dict[str, Any], input_key: Optional[str] = None
@@ -61,14 +171,15 @@ class SageMakerAsyncClient:
             S3 URI of uploaded data
         """
         if input_key is None:
+            # The suffix keeps keys unique when uploads run concurrently
             timestamp = int(time.time())
-            input_key = f"async-inference-input/{timestamp}.json"
+            input_key = f"async-inference-input/{timestamp}-{uuid.uuid4().hex}.json"
 
         try:
             self.s3.put_object(
                 Bucket=self.bucket_name,
                 Key=input_key,
-                Body=json.dumps(data, indent=2),
+                Body=json.dumps(data),
                 ContentType="application/json",
             )
 
@@ -97,9 +208,14 @@ class SageMakerAsyncClient:
                 EndpointName=self.endpoint_name,
                 InputLocation=input_location,
                 ContentType="application/json",
+                Accept=self.accept,
             )
 
             output_location = response["OutputLocation"]
+            self._inference_ids[output_location] = response["InferenceId"]
+            if self.sqs:
+                with self._notifications_lock:
+                    self._expected_ids.add(response["InferenceId"])
             logger.info(
                 f"Async invocation started. Results will be at: {output_location}"
             )
@@ -112,15 +228,15 @@ class SageMakerAsyncClient:
             raise
 
     def wait_for_results(
-        self, output_location: str, max_wait: int = 300, poll_interval: int = 5
+        self, output_location: str, max_wait: int = 300, poll_interval: int = 10
     ) -> Dict[str, Any]:
         """
-        Poll for async inference results.
+        Poll for async inference results with jittered exponential backoff.
 
         Args:
             output_location: S3 URI where results will be stored
             max_wait: Maximum wait time in seconds
-            poll_interval: Polling interval in seconds
+            poll_interval: Maximum polling interval in seconds
 
         Returns:
             Results dictionary
@@ -129,30 +245,191 @@ class SageMakerAsyncClient:
         bucket = parsed.netloc
         key = parsed.path.lstrip("/")
 
+        inference_id = self._inference_ids.pop(output_location, None)
+        if self.sqs and inference_id:
+            self._wait_for_notification(inference_id, max_wait)
+            results = _decode_results(self._get_object_hedged(bucket, key))
+            logger.info("Results retrieved successfully")
+            return results
+
         logger.info(f"Waiting for results at {output_location}")
 
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
+        start_time = time.monotonic()
+        delay = min(INITIAL_POLL_DELAY, poll_interval)
+        while time.monotonic() - start_time < max_wait:
             try:
-                response = self.s3.get_object(Bucket=bucket, Key=key)
-                results = json.loads(response["Body"].read())
-                logger.info("Results retrieved successfully")
-                return results
-
-            except self.s3.exceptions.NoSuchKey:
-                logger.debug(
-                    f"Results not ready yet, waiting {poll_interval} seconds..."
-                )
+                # Cheap readiness probe; the body is only downloaded once
+                self.s3.head_object(Bucket=bucket, Key=key)
+
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                    logger.error(f"Error checking for results: {e}")
+                    raise
+                # Jitter the capped delay, never sleeping past the deadline
+                remaining = max_wait - (time.monotonic() - start_time)
+                wait = min(delay + random.uniform(0, delay * 0.1), remaining)
+                logger.debug(f"Results not ready yet, waiting {wait:.1f} seconds...")
                 # nosemgrep arbitrary-sleep
-                time.sleep(poll_interval)
+                time.sleep(max(wait, 0))
+                delay = min(delay * BACKOFF_FACTOR, poll_interval)
                 continue
 
+            try:
+                results = _decode_results(self._get_object_hedged(bucket, key))
+                logger.info("Results retrieved successfully")
+                return results
+
             except Exception as e:
                 logger.error(f"Error retrieving results: {e}")
                 raise
 
         raise TimeoutError(f"Results not available within {max_wait} seconds")
 
+    def _wait_for_notification(self, inference_id: str, max_wait: int) -> None:
+        """
+        Long-poll the notification queue until the inference completes.
+
+        Notifications for other inferences started by this client are held
+        briefly so concurrent waiters can pick them up; any other message is
+        made visible again straight away for the queue's other consumers.
+
+        Args:
+            inference_id: SageMaker InferenceId returned by invoke_async
+            max_wait: Maximum wait time in seconds
+
+        Raises:
+            RuntimeError: If SageMaker reports the inference as failed
+            TimeoutError: If no notification arrives within max_wait
+        """
+        logger.info(f"Waiting for completion notification for {inference_id}")
+
+        deadline = time.monotonic() + max_wait
+        try:
+            while True:
+                with self._notifications_lock:
+                    notification = self._notifications.pop(inference_id, None)
+                if notification:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Results not available within {max_wait} seconds"
+                    )
+
+                response = self.sqs.receive_message(
+                    QueueUrl=self.notification_queue_url,
+                    MaxNumberOfMessages=10,
+                    WaitTimeSeconds=min(
+                        NOTIFICATION_WAIT_SECONDS, max(1, int(remaining))
+                    ),
+                )
+                self._hold_notifications(response.get("Messages", []))
+        finally:
+            with self._notifications_lock:
+                self._expected_ids.discard(inference_id)
+
+        body, receipt_handle, _ = notification
+        self.sqs.delete_message(
+            QueueUrl=self.notification_queue_url, ReceiptHandle=receipt_handle
+        )
+        if body.get("invocationStatus") != "Completed":
+            raise RuntimeError(
+                f"Inference {inference_id} failed: {body.get('failureReason', 'unknown error')}"
+            )
+
+    def _hold_notifications(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Hold received notifications for this client's pending inferences.
+
+        Messages for unknown inferences, and held ones that have expired or
+        overflow MAX_HELD_NOTIFICATIONS, are released back to the queue.
+
+        Args:
+            messages: Messages returned by SQS ReceiveMessage
+        """
+        now = time.monotonic()
+        released = []
+        with self._notifications_lock:
+            for message in messages:
+                body = json.loads(message["Body"])
+                received_id = body.get("inferenceId")
+                if received_id in self._expected_ids:
+                    self._notifications[received_id] = (
+                        body,
+                        message["ReceiptHandle"],
+                        now,
+                    )
+                else:
+                    released.append(message["ReceiptHandle"])
+
+            # Entries are inserted in arrival order, so the oldest come first
+            for held_id, (_, receipt_handle, received_at) in list(
+                self._notifications.items()
+            ):
+                expired = now - received_at > NOTIFICATION_HOLD_SECONDS
+                if not expired and len(self._notifications) <= MAX_HELD_NOTIFICATIONS:
+                    break
+                del self._notifications[held_id]
+                released.append(receipt_handle)
+
+        for receipt_handle in released:
+            try:
+                self.sqs.change_message_visibility(
+                    QueueUrl=self.notification_queue_url,
+                    ReceiptHandle=receipt_handle,
+                    VisibilityTimeout=0,
+                )
+            except ClientError as e:
+                logger.warning(f"Could not release notification: {e}")
+
+    def _read_object(self, bucket: str, key: str) -> bytes:
+        """Download an S3 object body, record how long it took, and gunzip it if needed."""
+        start = time.monotonic()
+        response = self.s3.get_object(Bucket=bucket, Key=key)
+        body = response["Body"].read()
+        self._get_latencies.append(time.monotonic() - start)
+        if response.get("ContentEncoding") == "gzip" or body[:2] == GZIP_MAGIC:
+            body = gzip.decompress(body)
+        return body
+
+    def _get_object_hedged(self, bucket: str, key: str) -> bytes:
+        """
+        Download an S3 object, sending a duplicate GET if the first one straggles.
+
+        Args:
+            bucket: S3 bucket name
+            key: S3 object key
+
+        Returns:
+            Body of whichever GET finishes first
+        """
+        expected = (
+            statistics.median(self._get_latencies)
+            if self._get_latencies
+            else DEFAULT_GET_LATENCY
+        )
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            futures = [executor.submit(self._read_object, bucket, key)]
+            done, _ = concurrent.futures.wait(
+                futures, timeout=HEDGE_LATENCY_MULTIPLIER * expected
+            )
+            if not done:
+                logger.debug("Result GET is slow, sending a duplicate request")
+                futures.append(executor.submit(self._read_object, bucket, key))
+
+            error = None
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+            raise error
+        finally:
+            # Do not wait for the losing request
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def predict(self, data: Dict[str, Any], max_wait: int = 300) -> Dict[str, Any]:
         """
         Complete prediction workflow: upload, invoke, wait for results.
@@ -173,6 +450,54 @@ class SageMakerAsyncClient:
         # Wait for and return results
         return self.wait_for_results(output_location, max_wait)
 
+    async def predict_many(
+        self, sequences: List[str], max_wait: int = 300
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Run the prediction workflow for many sequences concurrently.
+
+        Uploads, invocations and polls for all sequences overlap, so the total
+        time approaches the slowest single prediction rather than the sum.
+
+        Args:
+            sequences: Protein sequences to score
+            max_wait: Maximum wait time for each result
+
+        Returns:
+            Results in input order; a failed prediction yields its exception
+        """
+        return await asyncio.gather(
+            *[
+                asyncio.to_thread(self.predict, {"sequence": sequence}, max_wait)
+                for sequence in sequences
+            ],
+            return_exceptions=True,
+        )
+
+    def predict_many_threads(
+        self, data_list: List[Dict[str, Any]], max_wait: int = 300, max_workers: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the prediction workflow for many inputs on a thread pool.
+
+        Synchronous counterpart of predict_many. All threads share this
+        client's boto3 clients, which are thread-safe; a boto3 Session is
+        not, so do not share one across threads.
+
+        Args:
+            data_list: Input data dictionaries
+            max_wait: Maximum wait time for each result
+            max_workers: Number of concurrent predictions
+
+        Returns:
+            Results in input order; the first failed prediction is raised
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.predict, data, max_wait) for data in data_list
+            ]
+            return [future.result() for future in futures]
+
 
 def create_sample_input() -> Dict[str, Any]:
     """Create sample input data for AMPLIFY model."""
@@ -190,6 +515,15 @@ def main():
     parser.add_argument("--bucket-name", required=True, help="S3 bucket name")
     parser.add_argument("--region", default="us-east-1", help="AWS region")
     parser.add_argument("--input-file", help="JSON file with input data")
+    parser.add_argument(
+        "--binary-output",
+        action="store_true",
+        help="Request the compact float16 binary heatmap instead of JSON",
+    )
+    parser.add_argument(
+        "--notification-queue-url",
+        help="SQS queue URL for completion notifications (polls S3 if omitted)",
+    )
     parser.add_argument(
         "--max-wait", type=int, default=300, help="Maximum wait time in seconds"
     )
@@ -201,6 +535,8 @@ def main():
         endpoint_name=args.endpoint_name,
         bucket_name=args.bucket_name,
         region=args.region,
+        notification_queue_url=args.notification_queue_url,
+        binary_output=args.binary_output,
     )
 
     # Prepare input data
@@ -220,7 +556,7 @@ def main():
         print("\n" + "=" * 50)
         print("PREDICTION RESULTS")
         print("=" * 50)
-        print(json.dumps(results, indent=2))
+        print(json.dumps(results, indent=2, default=lambda o: o.tolist()))
 
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
@@ -5,11 +5,25 @@ import boto3
 import json
 import base64
 import time
+import random
 import argparse
 from datetime import datetime
 import sys
+from botocore.config import Config
 
-lambda_client = boto3.client("lambda")
+lambda_client = boto3.client(
+    "lambda",
+    config=Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 5},
+    ),
+)
+
+# First delay between result polls in seconds; grows by BACKOFF_FACTOR per poll
+# up to the poll interval (or the server's check_interval_seconds)
+INITIAL_POLL_DELAY = 2
+BACKOFF_FACTOR = 1.8
 
 
 def invoke_lambda_tool(function_name, tool_name, event_data):
@@ -72,7 +86,7 @@ To find your Lambda function name:
         "--poll-interval",
         type=int,
         default=15,
-        help="Initial polling interval in seconds (default: 15)",
+        help="Maximum polling interval in seconds (default: 15)",
     )
 
     return parser.parse_args()
@@ -129,11 +143,12 @@ def main():
         print_separator("STEP 2: POLLING FOR RESULTS")
 
         max_attempts = args.max_attempts  # Maximum polling attempts
-        poll_interval = args.poll_interval  # Seconds between polls
+        poll_interval = args.poll_interval  # Maximum seconds between polls
+        delay = INITIAL_POLL_DELAY
         attempt = 1
 
         print(
-            f"🔄 Starting to poll for results (max {max_attempts} attempts, {poll_interval}s intervals)"
+            f"🔄 Starting to poll for results (max {max_attempts} attempts, backing off up to {poll_interval}s)"
         )
 
         while attempt <= max_attempts:
@@ -260,8 +275,12 @@ def main():
 
             # Wait before next attempt (unless this was the last attempt)
             if attempt < max_attempts:
-                print(f"⏸️  Waiting {poll_interval} seconds before next check...")
-                time.sleep(poll_interval)
+                # Jitter is taken from the capped delay so waits stay bounded
+                delay = min(delay, poll_interval)
+                wait = delay + random.uniform(0, delay * 0.1)
+                print(f"⏸️  Waiting {wait:.1f} seconds before next check...")
+                time.sleep(wait)
+                delay = min(delay * BACKOFF_FACTOR, poll_interval)
 
             attempt += 1
 
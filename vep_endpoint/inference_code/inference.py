@@ -1,38 +1,90 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import json
+import gzip
 import logging
 import os
+import struct
+import time
 
 import numpy as np
+import orjson
 import torch
 from matplotlib import pyplot as plt
 from transformers import AutoModel, AutoTokenizer
 
 logging.basicConfig(level=logging.INFO)
 
+# Number of single-position masked sequences scored per forward pass
+MASK_BATCH_SIZE = int(os.getenv("AMPLIFY_MASK_BATCH_SIZE", "32"))
+
+# Accept type for gzip-compressed JSON, and its gzip level; the heatmap text
+# compresses ~5-10x. Plain application/json stays uncompressed
+GZIP_JSON_CONTENT_TYPE = "application/json+gzip"
+OUTPUT_GZIP_LEVEL = 6
+
+# Accept type for the binary response: a little-endian uint32 header length,
+# a JSON header with shape, dtype and outliers, then the raw float16 heatmap
+HEATMAP_BINARY_CONTENT_TYPE = "application/x-amplify-heatmap"
+
+# Compile the model for repeated fixed-shape forward passes (GPU only). Off by
+# default: each new sequence length changes the input shape and triggers a
+# recompile, so only enable it when requests share a few fixed lengths
+TORCH_COMPILE = (
+    os.getenv("AMPLIFY_TORCH_COMPILE", "0") == "1" and torch.cuda.is_available()
+)
+
+# Standard amino acids in heatmap row order, with their three-letter codes
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+AMINO_ACID_MAPPING = {
+    "A": "Ala",  # Alanine
+    "C": "Cys",  # Cysteine
+    "D": "Asp",  # Aspartic acid
+    "E": "Glu",  # Glutamic acid
+    "F": "Phe",  # Phenylalanine
+    "G": "Gly",  # Glycine
+    "H": "His",  # Histidine
+    "I": "Ile",  # Isoleucine
+    "K": "Lys",  # Lysine
+    "L": "Leu",  # Leucine
+    "M": "Met",  # Methionine
+    "N": "Asn",  # Asparagine
+    "P": "Pro",  # Proline
+    "Q": "Gln",  # Glutamine
+    "R": "Arg",  # Arginine
+    "S": "Ser",  # Serine
+    "T": "Thr",  # Threonine
+    "V": "Val",  # Valine
+    "W": "Trp",  # Tryptophan
+    "Y": "Tyr",  # Tyrosine
+}
+
+AMINO_ACID_3 = tuple(AMINO_ACID_MAPPING[aa] for aa in AMINO_ACIDS)
+AMINO_ACID_3_ARRAY = np.array(AMINO_ACID_3)
+
 
 def identify_outliers_percentile(heatmap, low_percentile=1, high_percentile=99):
-    """Identify outliers using percentile thresholds"""
-    flat_values = heatmap.flatten()
-    low_threshold = np.percentile(flat_values, low_percentile)
+    """Identify outliers using percentile thresholds, on the heatmap tensor's device"""
+    quantiles = torch.tensor(
+        [low_percentile / 100, high_percentile / 100],
+        dtype=heatmap.dtype,
+        device=heatmap.device,
+    )
+    low_threshold, high_threshold = torch.quantile(heatmap.flatten(), quantiles).tolist()
     print(f"Low threshold: {low_threshold}")
-    high_threshold = np.percentile(flat_values, high_percentile)
     print(f"High threshold: {high_threshold}")
 
-    high_outliers = []
-    low_outliers = []
     print(f"Heatmap shape is {heatmap.shape}")
-    for i in range(heatmap.shape[0]):
-        for j in range(heatmap.shape[1]):
-            value = heatmap[i, j]
-            if value >= high_threshold:
-                high_outliers.append((i, j, value))
-            elif value <= low_threshold:
-                low_outliers.append((i, j, value))
-    combined_outliers = low_outliers + high_outliers
-    return sorted(combined_outliers, key=lambda x: x[2])
+    outlier_mask = (heatmap >= high_threshold) | (heatmap <= low_threshold)
+    rows, cols = torch.nonzero(outlier_mask, as_tuple=True)
+    values = heatmap[rows, cols]
+    order = torch.argsort(values, stable=True)
+    # Only the outliers leave the device, as (rows, cols, values) arrays
+    return (
+        rows[order].cpu().numpy(),
+        cols[order].cpu().numpy(),
+        values[order].double().cpu().numpy(),
+    )
 
 
 def model_fn(model_dir):
@@ -56,9 +108,22 @@ def model_fn(model_dir):
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
         model = model.to(device)
+        model.eval()
         logging.info(f"[custom] model_fn: Moved model to {device} device")
 
-        return model, tokenizer, device
+        if TORCH_COMPILE:
+            # Every batch in predict_fn has the same shape for a given sequence
+            # length, so CUDA graphs can replay it without per-call dispatch
+            model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+            logging.info("[custom] model_fn: Compiled model with torch.compile")
+
+        # Token IDs used by every request, looked up once here
+        aa_token_ids = torch.tensor(
+            tokenizer.convert_tokens_to_ids(list(AMINO_ACIDS)), device=device
+        )
+        mask_token_id = int(tokenizer.mask_token_id)
+
+        return model, tokenizer, device, aa_token_ids, mask_token_id
 
     except Exception as e:
         logging.error(
@@ -71,11 +136,11 @@ def model_fn(model_dir):
 def input_fn(request_body, content_type="application/json"):
     """
     Pre-processes the input data. Assumes the input is JSON.
-    The input should contain a protein sequence.
+    The input should contain a protein sequence, or a list of sequences.
     """
     logging.info("input_fn: Received input")
     if content_type == "application/json":
-        input_data = json.loads(request_body)
+        input_data = orjson.loads(request_body)
         sequence = input_data["sequence"]
         return sequence
     else:
@@ -86,14 +151,61 @@ def predict_fn(input_data, model_artifacts):
     """
     Tokenizes the input protein sequence and runs inference on the model.
     The model is already loaded on the GPU for inference.
+    A list of sequences returns a list of (heatmap, outliers) results.
     Adapted from https://huggingface.co/blog/AmelieSchreiber/mutation-scoring#log-likelihood-ratios-and-point-mutations
     """
-    import time
-
     start_time = time.time()
 
     logging.info("predict_vep_fn: Running inference")
-    model, tokenizer, device = model_artifacts
+    if isinstance(input_data, str):
+        heatmap_gpu, hgvs_outliers = _score_sequence(
+            input_data, model_artifacts, start_time
+        )
+        # Single device-to-host copy of the finished heatmap
+        prediction = (heatmap_gpu.cpu().double().numpy(), hgvs_outliers)
+    else:
+        prediction = _score_sequences(input_data, model_artifacts, start_time)
+
+    total_time = time.time() - start_time
+    logging.info(f"Inference completed in {total_time:.1f} seconds")
+
+    return prediction
+
+
+def _score_sequences(sequences, model_artifacts, start_time):
+    """
+    Scores several sequences in turn. On GPU each finished heatmap is copied
+    to pinned host memory on a side stream while the next sequence runs.
+    """
+    device = model_artifacts[2]
+    copy_stream = torch.cuda.Stream() if device == "cuda" else None
+
+    results = []
+    for sequence in sequences:
+        heatmap, hgvs_outliers = _score_sequence(sequence, model_artifacts, start_time)
+        if copy_stream is not None:
+            # The copy waits for this heatmap's kernels only, not the next forward passes
+            copy_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(copy_stream):
+                heatmap_host = torch.empty(
+                    heatmap.shape, dtype=heatmap.dtype, pin_memory=True
+                )
+                heatmap_host.copy_(heatmap, non_blocking=True)
+            heatmap.record_stream(copy_stream)
+            heatmap = heatmap_host
+        results.append((heatmap, hgvs_outliers))
+
+    if copy_stream is not None:
+        copy_stream.synchronize()
+    return [(heatmap.double().numpy(), hgvs) for heatmap, hgvs in results]
+
+
+def _score_sequence(input_data, model_artifacts, start_time):
+    """
+    Scores every single-residue substitution of one sequence.
+    Returns the heatmap, still on the model's device, and the HGVS outliers.
+    """
+    model, tokenizer, device, aa_token_ids, mask_token_id = model_artifacts
     sequence_length = len(input_data)
     logging.info(input_data)
     logging.info(f"Sequence length is {sequence_length}")
@@ -107,122 +219,106 @@ def predict_fn(input_data, model_artifacts):
     input_ids = tokenizer.encode(input_data, return_tensors="pt")
     logging.info(f"Encoded sequence shape is {input_ids.shape}")
 
-    input_ids = input_ids.to(device)
-
-    # Define standard AAs
-    amino_acids = list("ACDEFGHIKLMNPQRSTVWY")
-    amino_acid_mapping = {
-        "A": "Ala",  # Alanine
-        "C": "Cys",  # Cysteine
-        "D": "Asp",  # Aspartic acid
-        "E": "Glu",  # Glutamic acid
-        "F": "Phe",  # Phenylalanine
-        "G": "Gly",  # Glycine
-        "H": "His",  # Histidine
-        "I": "Ile",  # Isoleucine
-        "K": "Lys",  # Lysine
-        "L": "Leu",  # Leucine
-        "M": "Met",  # Methionine
-        "N": "Asn",  # Asparagine
-        "P": "Pro",  # Proline
-        "Q": "Gln",  # Glutamine
-        "R": "Arg",  # Arginine
-        "S": "Ser",  # Serine
-        "T": "Thr",  # Threonine
-        "V": "Val",  # Valine
-        "W": "Trp",  # Tryptophan
-        "Y": "Tyr",  # Tyrosine
-    }
-
-    amino_acid_3 = [
-        "Ala",
-        "Cys",
-        "Asp",
-        "Glu",
-        "Phe",
-        "Gly",
-        "His",
-        "Ile",
-        "Lys",
-        "Leu",
-        "Met",
-        "Asn",
-        "Pro",
-        "Gln",
-        "Arg",
-        "Ser",
-        "Thr",
-        "Val",
-        "Trp",
-        "Tyr",
-    ]
-
-    # Initialize heatmap
-    heatmap = np.zeros((20, sequence_length))
-    masked_input_ids = input_ids.clone()
+    # Pinned host memory lets the one host-to-device copy run asynchronously
+    if device == "cuda":
+        input_ids = input_ids.pin_memory()
+    input_ids = input_ids.to(device, non_blocking=True)
+
+    # Initialize heatmap on the device so scores stay there until the end
+    heatmap_gpu = torch.empty((len(AMINO_ACIDS), sequence_length), device=device)
+    positions = torch.arange(1, sequence_length + 1, device=device)
+    wt_token_ids = input_ids[0, positions]
+
+    # Device buffer for the masked batches, allocated once and refilled per batch
+    max_batch_size = (
+        MASK_BATCH_SIZE if TORCH_COMPILE else min(MASK_BATCH_SIZE, sequence_length)
+    )
+    masked_buffer = torch.empty(
+        (max_batch_size, input_ids.shape[1]), dtype=input_ids.dtype, device=device
+    )
     logging.info("Beginning analysis")
 
-    # Process positions with progress logging
-    for position in range(1, sequence_length + 1):
+    # Score positions in mini-batches: row b of a batch is the input sequence
+    # with only its target position masked
+    for batch_start in range(0, sequence_length, MASK_BATCH_SIZE):
+        batch_end = min(batch_start + MASK_BATCH_SIZE, sequence_length)
+        batch_positions = positions[batch_start:batch_end]
+        batch_rows = torch.arange(batch_end - batch_start, device=device)
+
         # Log progress every 50 positions to avoid log spam
-        if position % 50 == 0 or position == 1:
+        if batch_start == 0 or batch_end // 50 > batch_start // 50:
             elapsed = time.time() - start_time
             logging.info(
-                f"Processing position {position}/{sequence_length} (elapsed: {elapsed:.1f}s)"
+                f"Processing positions {batch_start + 1}-{batch_end}/{sequence_length} (elapsed: {elapsed:.1f}s)"
             )
 
-        # Mask the target position
-        masked_input_ids[0, position] = tokenizer.mask_token_id
-
-        # Get logits for the masked token
-        with torch.no_grad():
+        # Mask the target position of each row. A compiled model always gets
+        # full batches, padding the last one with unmasked rows, so it keeps
+        # a single input shape
+        batch_size = MASK_BATCH_SIZE if TORCH_COMPILE else len(batch_rows)
+        masked_input_ids = masked_buffer[:batch_size]
+        masked_input_ids.copy_(input_ids.expand(batch_size, -1))
+        masked_input_ids[batch_rows, batch_positions] = mask_token_id
+
+        # Get logits for the masked tokens, running the forward pass in BF16
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda", dtype=torch.bfloat16, enabled=device == "cuda"
+        ):
             logits = model(masked_input_ids).logits
 
-        # Calculate log probabilities
-        probabilities = torch.nn.functional.softmax(logits[0, position], dim=0)
-        log_probabilities = torch.log(probabilities)
-
-        # Get the log probability of the wild-type residue
-        wt_residue = input_ids[0, position].item()
-        log_prob_wt = log_probabilities[wt_residue].item()
-
-        # Calculate LLR for each variant
-        for i, amino_acid in enumerate(amino_acids):
-            log_prob_mt = log_probabilities[
-                tokenizer.convert_tokens_to_ids(amino_acid)
-            ].item()
-            heatmap[i, position - 1] = log_prob_mt - log_prob_wt
-
-        # Clear cache periodically to prevent memory buildup
-        if position % 100 == 0:
-            torch.cuda.empty_cache()
-
-    outliers = identify_outliers_percentile(heatmap)
-    hgvs_outliers = []
-
-    for outlier in outliers:
-        aa_end = amino_acid_3[outlier[0]]
-        pos = outlier[1]
-        score = outlier[2]
-        aa_start = amino_acid_mapping[input_data[pos]]
-        hgvs_outliers.append((aa_start + str(pos) + aa_end + " " + str(score)))
+        # Calculate log probabilities at each row's masked position in FP32
+        log_probabilities = torch.nn.functional.log_softmax(
+            logits[batch_rows, batch_positions].float(), dim=-1
+        )
 
-    total_time = time.time() - start_time
-    logging.info(f"Inference completed in {total_time:.1f} seconds")
+        # Calculate LLR of every variant against the wild-type residue
+        log_prob_wt = log_probabilities.gather(
+            1, wt_token_ids[batch_start:batch_end].unsqueeze(1)
+        )
+        heatmap_gpu[:, batch_start:batch_end] = (
+            log_probabilities[:, aa_token_ids] - log_prob_wt
+        ).T
+
+    rows, cols, scores = identify_outliers_percentile(heatmap_gpu)
+    hgvs_outliers = [
+        f"{AMINO_ACID_MAPPING[input_data[pos]]}{pos}{aa_end} {score:.4f}"
+        for pos, aa_end, score in zip(
+            cols.tolist(), AMINO_ACID_3_ARRAY[rows].tolist(), scores.tolist()
+        )
+    ]
 
-    return (heatmap, hgvs_outliers)
+    return heatmap_gpu, hgvs_outliers
 
 
 def output_fn(prediction, accept="application/json"):
     """
     Post-processes the output, returning the model's predictions.
-    Converts the output to a JSON-serializable format.
+    Converts the output to JSON, gzip-compressed when the gzip JSON type is
+    requested; readers detect the gzip magic bytes since async inference
+    does not set Content-Encoding.
+    A list of predictions becomes a JSON array of results.
     """
     logging.info("output_fn: Formatting output")
-    if accept == "application/json":
-        return (
-            json.dumps({"heatmap": prediction[0].tolist(), "outliers": prediction[1]}),
-            accept,
+    if accept in ("application/json", GZIP_JSON_CONTENT_TYPE):
+        results = [
+            {"heatmap": heatmap.astype(np.float32), "outliers": outliers}
+            for heatmap, outliers in (
+                prediction if isinstance(prediction, list) else [prediction]
+            )
+        ]
+        # orjson serializes the float32 array natively, without a tolist() walk
+        body = orjson.dumps(
+            results if isinstance(prediction, list) else results[0],
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+        if accept == GZIP_JSON_CONTENT_TYPE:
+            body = gzip.compress(body, compresslevel=OUTPUT_GZIP_LEVEL)
+        return body, accept
+    elif accept == HEATMAP_BINARY_CONTENT_TYPE and not isinstance(prediction, list):
+        heatmap = prediction[0].astype("<f2")
+        header = orjson.dumps(
+            {"shape": heatmap.shape, "dtype": "float16", "outliers": prediction[1]}
         )
+        return struct.pack("<I", len(header)) + header + heatmap.tobytes(), accept
     else:
         raise ValueError(f"Unsupported accept type: {accept}")
\ No newline at end of file
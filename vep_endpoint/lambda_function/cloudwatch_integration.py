@@ -8,56 +8,156 @@ This module provides basic CloudWatch logging and metrics functionality
 for the SageMaker async endpoint Lambda function.
 """
 
+import atexit
 import json
 import logging
 import os
+import threading
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections and adaptive retries for metric publishing. botocore
+# gzips PutMetricData bodies natively but only above 10 KB by default; the
+# repeated metric and dimension names in a flushed batch compress well even
+# at a few KB, so compression starts at 1 KB
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    request_min_compression_size_bytes=1024,
+)
+
+# Namespace for all function metrics
+METRIC_NAMESPACE = 'SageMaker/AsyncEndpoint'
+
+# Buffered metrics are sent once this many are pending, and at handler end
+METRIC_FLUSH_THRESHOLD = 20
+
+# CloudWatch accepts up to 1000 MetricData entries per put_metric_data call
+MAX_METRICS_PER_REQUEST = 1000
+
 # Global CloudWatch client for reuse
 _cloudwatch_client = None
 
+# Metric dimensions from the function's environment, which does not change
+# during a Lambda container's lifetime; built once by _function_dimensions()
+_metric_dimensions: Optional[List[Dict[str, str]]] = None
+
 
 def get_cloudwatch_client():
     """Get CloudWatch client (lazy initialization)."""
     global _cloudwatch_client
     if _cloudwatch_client is None:
         try:
-            _cloudwatch_client = boto3.client('cloudwatch')
+            _cloudwatch_client = boto3.client('cloudwatch', config=CLIENT_CONFIG)
         except Exception as e:
             logger.warning(f"Failed to initialize CloudWatch client: {e}")
     return _cloudwatch_client
 
 
+class _MetricBuffer:
+    """In-process buffer of metric data sent to CloudWatch in batches."""
+
+    def __init__(self):
+        self._metrics: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, metric: Dict[str, Any]):
+        """Queue a metric, flushing once the threshold is reached."""
+        self.extend([metric])
+
+    def extend(self, metrics: List[Dict[str, Any]]):
+        """Queue several metrics at once, flushing once the threshold is reached."""
+        with self._lock:
+            self._metrics.extend(metrics)
+            full = len(self._metrics) >= METRIC_FLUSH_THRESHOLD
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Send all queued metrics with as few put_metric_data calls as possible."""
+        with self._lock:
+            metrics, self._metrics = self._metrics, []
+        if not metrics:
+            return
+
+        try:
+            cw = get_cloudwatch_client()
+            if cw:
+                for start in range(0, len(metrics), MAX_METRICS_PER_REQUEST):
+                    cw.put_metric_data(
+                        Namespace=METRIC_NAMESPACE,
+                        MetricData=metrics[start:start + MAX_METRICS_PER_REQUEST]
+                    )
+        except Exception as e:
+            logger.warning(f"Failed to put {len(metrics)} metrics: {e}")
+
+
+# Global metric buffer, drained at the end of each handler invocation
+_metric_buffer = _MetricBuffer()
+
+
 def put_simple_metric(metric_name: str, value: float, unit: str = 'Count'):
     """
-    Put a simple metric to CloudWatch.
+    Queue a simple metric for CloudWatch.
+
+    Metrics are buffered and sent in batches by flush_metrics().
     
     Args:
         metric_name: Name of the metric
         value: Metric value
         unit: Metric unit (Count, Milliseconds, Bytes, etc.)
     """
-    try:
-        cw = get_cloudwatch_client()
-        if cw:
-            cw.put_metric_data(
-                Namespace='SageMaker/AsyncEndpoint',
-                MetricData=[{
-                    'MetricName': metric_name,
-                    'Value': value,
-                    'Unit': unit,
-                    'Dimensions': [
-                        {'Name': 'FunctionName', 'Value': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown')}
-                    ]
-                }]
-            )
-    except Exception as e:
-        logger.warning(f"Failed to put metric {metric_name}: {e}")
+    _metric_buffer.add(_metric_datum(metric_name, value, unit, _function_dimensions()))
+
+
+def put_batch_metrics(metrics: Iterable[Tuple[str, float, str]]):
+    """
+    Queue several metrics for CloudWatch in one step.
+
+    Args:
+        metrics: (metric_name, value, unit) tuples
+    """
+    dimensions = _function_dimensions()
+    _metric_buffer.extend(
+        [_metric_datum(name, value, unit, dimensions) for name, value, unit in metrics]
+    )
+
+
+def _function_dimensions() -> List[Dict[str, str]]:
+    """Get the FunctionName dimension attached to every metric, built once."""
+    global _metric_dimensions
+    if _metric_dimensions is None:
+        _metric_dimensions = [
+            {'Name': 'FunctionName', 'Value': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown')}
+        ]
+    return _metric_dimensions
+
+
+def _metric_datum(
+    metric_name: str, value: float, unit: str, dimensions: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """Build a single MetricData entry, stamped with when it was recorded."""
+    return {
+        'MetricName': metric_name,
+        'Value': value,
+        'Unit': unit,
+        'Dimensions': dimensions,
+        'Timestamp': datetime.now(timezone.utc),
+    }
+
+
+def flush_metrics():
+    """Send all buffered metrics to CloudWatch."""
+    _metric_buffer.flush()
+
+
+atexit.register(flush_metrics)
 
 
 def log_event(event_type: str, data: Dict[str, Any]):
@@ -68,6 +168,9 @@ def log_event(event_type: str, data: Dict[str, Any]):
         event_type: Type of event being logged
         data: Event data to log
     """
+    # Skip building and serializing the entry when INFO records are dropped
+    if not logger.isEnabledFor(logging.INFO):
+        return
     log_entry = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "event_type": event_type,
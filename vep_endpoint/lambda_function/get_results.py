@@ -8,25 +8,151 @@ This module handles the retrieval of results from S3 for completed
 SageMaker async inference requests.
 """
 
+import codecs
+import concurrent.futures
 import json
 import logging
 import os
 import re
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 
 from validators import (
     validate_event_structure,
     create_validation_error_response,
     get_arn_components,
+    get_client_error_details,
 )
 from cloudwatch_integration import put_simple_metric, log_event
 
 logger = logging.getLogger(__name__)
 
+# Leading bytes of a gzip stream; the endpoint gzip-compresses its JSON output
+GZIP_MAGIC = b"\x1f\x8b"
+
+# S3 ClientError codes grouped by how lookups classify them
+_S3_NOT_FOUND_CODES = frozenset({"404", "NoSuchKey"})
+_S3_ACCESS_DENIED_CODES = frozenset({"403", "AccessDenied"})
+_S3_INVALID_NAME_CODES = frozenset({"InvalidBucketName", "InvalidObjectName"})
+_S3_THROTTLE_CODES = frozenset({"RequestTimeout", "ServiceUnavailable", "SlowDown"})
+
+# head_bucket ClientError codes grouped by how the bucket probe classifies them;
+# head_bucket has no response body, so a missing bucket can be a bare 404
+_S3_BUCKET_NOT_FOUND_CODES = frozenset({"404", "NoSuchBucket"})
+_S3_INVALID_BUCKET_CODES = frozenset({"InvalidBucketName", "InvalidRequest"})
+
+# Lookup status error and caller-facing message for each classified S3 error
+# code other than a missing key; messages may reference {bucket}
+_S3_LOOKUP_ERRORS = {
+    **dict.fromkeys(
+        _S3_ACCESS_DENIED_CODES, ("ACCESS_DENIED", "Access denied to S3 object")
+    ),
+    "NoSuchBucket": ("BUCKET_NOT_FOUND", "S3 bucket '{bucket}' does not exist"),
+    **dict.fromkeys(
+        _S3_INVALID_NAME_CODES, ("INVALID_S3_NAME", "Invalid S3 bucket or object name")
+    ),
+    **dict.fromkeys(
+        _S3_THROTTLE_CODES,
+        ("S3_SERVICE_UNAVAILABLE", "S3 service temporarily unavailable"),
+    ),
+}
+
+# Longest failure log text returned to the caller when it is not JSON; at most
+# one byte more than this is read, so longer logs are flagged as truncated
+FAILURE_MESSAGE_MAX_CHARS = 64 * 1024
+
+# Lookup status errors that are configuration problems, and those worth a retry
+_CRITICAL_S3_ERRORS = frozenset(
+    {"ACCESS_DENIED", "BUCKET_NOT_FOUND", "INVALID_S3_NAME"}
+)
+_TRANSIENT_S3_ERRORS = frozenset({"S3_SERVICE_UNAVAILABLE", "BOTO_CONNECTION_ERROR"})
+
+# S3 bucket name character rules, compiled once per container
+_BUCKET_RE = re.compile(r"^[a-z0-9][a-z0-9\-]*[a-z0-9]$")
+
+# Small connection pool and bounded retries for result lookups
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=16, retries={"mode": "standard", "max_attempts": 3}
+)
+
+# S3 client created once per container at import and reused across warm
+# Lambda invocations, keeping its connection pool and TLS sessions alive
+try:
+    _s3_client = boto3.client("s3", config=S3_CLIENT_CONFIG)
+except Exception as e:
+    logger.warning(f"Deferring S3 client creation: {e}")
+    _s3_client = None
+
+
+# S3 settings derived from the environment, which does not change during a
+# Lambda container's lifetime; read once by _get_s3_settings()
+_s3_settings: Optional[Dict[str, Any]] = None
+
+# Buckets already confirmed accessible in this container, so the head_bucket
+# probe runs once per bucket; entries are dropped when a later lookup is denied
+_bucket_access_cache: Dict[str, Dict[str, Any]] = {}
+
+# Largest object body read into memory, compressed or decompressed; larger
+# outputs would not fit the function's memory alongside their parsed form
+# and are left for the caller to download from S3
+MAX_RESULT_BYTES = 32 * 1024 * 1024
+
+# Parsed results of recently completed predictions keyed by "bucket/key" with
+# their lookup status, so repeat polls can issue a conditional GET and reuse
+# the parsed payload on 304 Not Modified. Bounded in entries and per-object
+# size to stay well within the function's memory.
+RESULT_CACHE_MAX_ENTRIES = 8
+RESULT_CACHE_MAX_OBJECT_BYTES = 1024 * 1024
+_result_cache: "OrderedDict[str, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+
+# Recently seen prediction failures keyed by "bucket/key" of the failure log. A
+# failed prediction is terminal, so repeat polls are answered without S3.
+_failure_cache: "OrderedDict[str, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+
+# Runs the success and failure path GETs, and the first bucket probe,
+# concurrently; boto3 clients are thread-safe, so all share the module S3 client
+_S3_CHECK_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+
+
+def _get_s3_client():
+    """Get the module S3 client, creating it if import-time creation failed."""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client("s3", config=S3_CLIENT_CONFIG)
+    return _s3_client
+
+
+def _get_s3_settings() -> Dict[str, Any]:
+    """
+    Get the S3 bucket, prefixes and their validation, reading the environment once.
+
+    Returns:
+        Dict with bucket, output_prefix, failure_prefix and validation keys
+    """
+    global _s3_settings
+    if _s3_settings is None:
+        bucket = os.environ.get("S3_BUCKET_NAME")
+        failure_prefix = os.environ.get(
+            "S3_FAILURE_PREFIX", "async-inference-failures"
+        ).rstrip("/")
+        _s3_settings = {
+            "bucket": bucket,
+            "output_prefix": os.environ.get(
+                "S3_OUTPUT_PREFIX", "async-inference-output"
+            ).rstrip("/"),
+            "failure_prefix": failure_prefix,
+            "validation": _validate_s3_configuration(
+                bucket, "async-inference-output", failure_prefix
+            ),
+        }
+    return _s3_settings
+
 
 def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -40,6 +166,8 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dict containing results or status information
     """
     start_time = datetime.now(timezone.utc)
+    # Timestamp shared by the responses and failure details of this invocation
+    now_iso = start_time.isoformat()
 
     try:
         # Log the get_results request
@@ -68,22 +196,23 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Handle both invocation ID and S3 output path
         # invocation_input = invocation_arn.strip()
 
+        s3_settings = _get_s3_settings()
+
         # Check if this is an S3 path or just an invocation ID
         if output_id.startswith("s3://"):
             # Extract bucket and key from S3 path
-            s3_path_parts = output_id.replace("s3://", "").split("/", 1)
-            if len(s3_path_parts) != 2:
+            s3_bucket_from_path, separator, output_key_from_path = (
+                output_id.removeprefix("s3://").partition("/")
+            )
+            if not separator:
                 return _error_response(
                     "INVALID_S3_PATH",
                     "Invalid S3 path format. Expected: s3://bucket/key",
                 )
 
-            s3_bucket_from_path = s3_path_parts[0]
-            output_key_from_path = s3_path_parts[1]
-
             # Extract invocation ID from the file name (assuming UUID format)
-            file_name = output_key_from_path.split("/")[-1]
-            output_id = file_name.replace(".out", "")
+            file_name = output_key_from_path.rpartition("/")[2]
+            output_id = file_name.removesuffix(".out")
 
             # Override S3 configuration with values from the path
             s3_bucket = s3_bucket_from_path
@@ -91,11 +220,8 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         else:
 
-            # Get environment variables for S3 configuration
-            s3_bucket = os.environ.get("S3_BUCKET_NAME")
-            s3_output_prefix = os.environ.get(
-                "S3_OUTPUT_PREFIX", "async-inference-output"
-            )
+            # S3 configuration from the environment
+            s3_bucket = s3_settings["bucket"]
 
             if not s3_bucket:
                 return _error_response(
@@ -104,19 +230,23 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 )
 
             # Construct S3 output key
-            output_key = f"{s3_output_prefix.rstrip('/')}/{output_id}.out"
-
-        s3_failure_prefix = os.environ.get(
-            "S3_FAILURE_PREFIX", "async-inference-failures"
-        )
+            output_key = f"{s3_settings['output_prefix']}/{output_id}.out"
 
         # Construct failure key
-        failure_key = f"{s3_failure_prefix.rstrip('/')}/{output_id}.out"
-
-        # Validate S3 configuration
-        config_validation = _validate_s3_configuration(
-            s3_bucket, "async-inference-output", s3_failure_prefix
-        )
+        failure_key = f"{s3_settings['failure_prefix']}/{output_id}.out"
+
+        # Validate S3 configuration; the environment settings were validated once,
+        # so a bucket from an s3:// path only needs its name checked. The full
+        # validator runs only to describe a failure.
+        config_validation = s3_settings["validation"]
+        if s3_bucket != s3_settings["bucket"] and not (
+            config_validation["is_valid"]
+            and 3 <= len(s3_bucket) <= 63
+            and _BUCKET_RE.match(s3_bucket)
+        ):
+            config_validation = _validate_s3_configuration(
+                s3_bucket, "async-inference-output", s3_settings["failure_prefix"]
+            )
         if not config_validation["is_valid"]:
             return _error_response(
                 "S3_CONFIGURATION_ERROR",
@@ -126,7 +256,7 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Initialize S3 client
         try:
-            s3_client = boto3.client("s3")
+            s3_client = _get_s3_client()
         except Exception as e:
             logger.error(f"Failed to initialize S3 client: {str(e)}")
             return _error_response(
@@ -135,18 +265,6 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 {"initialization_error": str(e)},
             )
 
-        # Validate S3 bucket accessibility
-        bucket_validation = _validate_s3_bucket_access(s3_client, s3_bucket)
-        if not bucket_validation["is_accessible"]:
-            return _error_response(
-                bucket_validation["error_code"],
-                bucket_validation["error_message"],
-                {
-                    "s3_bucket": s3_bucket,
-                    "validation_details": bucket_validation.get("details", {}),
-                },
-            )
-
         # S3 paths are already constructed above based on input type
 
         log_event(
@@ -160,27 +278,82 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             },
         )
 
-        # Check for successful results first
-        result_status = _check_s3_object_exists(s3_client, s3_bucket, output_key)
+        # Answer repeat polls of a failed prediction from this container
+        failure_cache_key = f"{s3_bucket}/{failure_key}"
+        cached_failure = _failure_cache.get(failure_cache_key)
+        if cached_failure:
+            _failure_cache.move_to_end(failure_cache_key)
+            failure_status, failure_data = cached_failure
+            return _prediction_failed_response(
+                output_id,
+                f"s3://{s3_bucket}/{failure_key}",
+                failure_status,
+                failure_data,
+                context,
+                now_iso,
+            )
+
+        # Speculatively GET both the results and the failure details concurrently,
+        # so every outcome is resolved in one round trip. A single
+        # list_objects_v2 cannot replace the pair: the output and failure
+        # prefixes share no parent short of the bucket root, and a listing
+        # would still need a follow-up GET for whichever key exists.
+        output_cache_key = f"{s3_bucket}/{output_key}"
+        cached_result = _result_cache.get(output_cache_key)
+        result_future = _S3_CHECK_POOL.submit(
+            _try_get_object,
+            s3_client,
+            s3_bucket,
+            output_key,
+            etag=cached_result[0].get("etag") if cached_result else None,
+        )
+        failure_future = _S3_CHECK_POOL.submit(
+            _try_get_object,
+            s3_client,
+            s3_bucket,
+            failure_key,
+            max_bytes=FAILURE_MESSAGE_MAX_CHARS + 1,
+        )
+
+        # Validate S3 bucket accessibility once per bucket per container, probing
+        # alongside the lookups instead of ahead of them
+        bucket_validation = _bucket_access_cache.get(s3_bucket)
+        if bucket_validation is None:
+            bucket_validation = _S3_CHECK_POOL.submit(
+                _validate_s3_bucket_access, s3_client, s3_bucket
+            ).result()
+            if bucket_validation["is_accessible"]:
+                _bucket_access_cache[s3_bucket] = bucket_validation
+        if not bucket_validation["is_accessible"]:
+            return _error_response(
+                bucket_validation["error_code"],
+                bucket_validation["error_message"],
+                {
+                    "s3_bucket": s3_bucket,
+                    "validation_details": bucket_validation.get("details", {}),
+                },
+            )
+
+        result_status = result_future.result()
+        if result_status["exists"]:
+            # The failure lookup is not needed; skip it if it has not started
+            failure_future.cancel()
 
         # Handle S3 access errors for output path
-        if result_status.get("error") and result_status["error"] not in [
-            "ACCESS_DENIED",
-            "BUCKET_NOT_FOUND",
-            "INVALID_S3_NAME",
-            "S3_SERVICE_UNAVAILABLE",
-            "BOTO_CONNECTION_ERROR",
-        ]:
+        result_error = result_status.get("error")
+        if (
+            result_error
+            and result_error not in _CRITICAL_S3_ERRORS
+            and result_error not in _TRANSIENT_S3_ERRORS
+        ):
             # For non-critical errors, continue to check failure path
             logger.warning(
                 f"Non-critical S3 error checking output path: {result_status.get('error_message', 'Unknown error')}"
             )
-        elif result_status.get("error") in [
-            "ACCESS_DENIED",
-            "BUCKET_NOT_FOUND",
-            "INVALID_S3_NAME",
-        ]:
-            # Critical configuration errors - return immediately
+        elif result_error in _CRITICAL_S3_ERRORS:
+            # Critical configuration errors - re-probe the bucket next time
+            # and return immediately
+            _bucket_access_cache.pop(s3_bucket, None)
             return _error_response(
                 result_status["error"],
                 f"S3 configuration error: {result_status.get('error_message', 'Unknown error')}",
@@ -191,10 +364,7 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "attempted_path": f"s3://{s3_bucket}/{output_key}",
                 },
             )
-        elif result_status.get("error") in [
-            "S3_SERVICE_UNAVAILABLE",
-            "BOTO_CONNECTION_ERROR",
-        ]:
+        elif result_error in _TRANSIENT_S3_ERRORS:
             # Temporary service issues - return with retry suggestion
             return _error_response(
                 result_status["error"],
@@ -207,16 +377,38 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 },
             )
 
+        if result_status.get("too_large"):
+            # Results are available but too large to return in the response
+            put_simple_metric("ResultsRetrievalError", 1)
+            return _error_response(
+                "RESULTS_TOO_LARGE",
+                f"Results exceed {MAX_RESULT_BYTES} bytes; download them from S3",
+                {
+                    "output_id": output_id,
+                    "s3_output_path": f"s3://{s3_bucket}/{output_key}",
+                    "content_length": result_status.get("content_length"),
+                },
+            )
+
         if result_status["exists"]:
             # Results are available - retrieve and parse them
             try:
-                results_data = _retrieve_s3_results(s3_client, s3_bucket, output_key)
+                if result_status.get("not_modified") and cached_result:
+                    # Unchanged since it was last parsed in this container
+                    result_status, results_data = cached_result
+                    _result_cache.move_to_end(output_cache_key)
+                else:
+                    # Hand over the only reference so the bytes can be freed once decoded
+                    results_data = _parse_s3_results(
+                        result_status.pop("body"), s3_bucket, output_key
+                    )
+                    _cache_result(output_cache_key, result_status, results_data)
 
                 # Calculate retrieval duration and result size
-                retrieval_duration_ms = (
-                    datetime.now(timezone.utc) - start_time
-                ).total_seconds() * 1000
-                result_size_bytes = len(str(results_data)) if results_data else 0
+                end_time = datetime.now(timezone.utc)
+                retrieval_duration_ms = (end_time - start_time).total_seconds() * 1000
+                # Stored object size from the GET response, not a re-serialization
+                result_size_bytes = result_status.get("content_length", 0)
 
                 # Record success metrics
                 put_simple_metric("ResultsRetrievalSuccess", 1)
@@ -245,6 +437,7 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                         "completion_time": result_status.get("last_modified"),
                     },
                     "Results retrieved successfully",
+                    timestamp=end_time.isoformat(),
                 )
 
             except Exception as e:
@@ -260,34 +453,26 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 )
 
         # Check for failure results
-        failure_status = _check_s3_object_exists(s3_client, s3_bucket, failure_key)
+        failure_status = failure_future.result()
 
         # Handle S3 access errors for failure path
-        if failure_status.get("error") and failure_status["error"] not in [
-            "ACCESS_DENIED",
-            "BUCKET_NOT_FOUND",
-            "INVALID_S3_NAME",
-            "S3_SERVICE_UNAVAILABLE",
-            "BOTO_CONNECTION_ERROR",
-        ]:
+        failure_error = failure_status.get("error")
+        if (
+            failure_error
+            and failure_error not in _CRITICAL_S3_ERRORS
+            and failure_error not in _TRANSIENT_S3_ERRORS
+        ):
             # For non-critical errors, continue to in-progress status
             logger.warning(
                 f"Non-critical S3 error checking failure path: {failure_status.get('error_message', 'Unknown error')}"
             )
-        elif failure_status.get("error") in [
-            "ACCESS_DENIED",
-            "BUCKET_NOT_FOUND",
-            "INVALID_S3_NAME",
-        ]:
+        elif failure_error in _CRITICAL_S3_ERRORS:
             # Critical configuration errors - but we already checked output, so this is likely the same issue
             # Continue to in-progress status but log the issue
             logger.error(
                 f"S3 configuration error checking failure path: {failure_status.get('error_message', 'Unknown error')}"
             )
-        elif failure_status.get("error") in [
-            "S3_SERVICE_UNAVAILABLE",
-            "BOTO_CONNECTION_ERROR",
-        ]:
+        elif failure_error in _TRANSIENT_S3_ERRORS:
             # Temporary service issues - we already handled this for output path
             logger.warning(
                 f"S3 service issue checking failure path: {failure_status.get('error_message', 'Unknown error')}"
@@ -296,33 +481,25 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if failure_status["exists"]:
             # Prediction failed - retrieve error details
             try:
-                failure_data = _retrieve_s3_failure_details(
-                    s3_client, s3_bucket, failure_key
-                )
-
-                # Record failure metrics
-                put_simple_metric("PredictionFailed", 1)
-
-                log_event(
-                    "failure_detected",
-                    {
-                        "output_id": output_id,
-                        "failure_time": failure_status.get("last_modified"),
-                        "request_id": context.aws_request_id,
-                    },
+                failure_data = _parse_s3_failure_details(
+                    failure_status.pop("body"),
+                    s3_bucket,
+                    failure_key,
+                    now_iso,
+                    content_length=failure_status.get("content_length"),
                 )
 
-                return _error_response(
-                    "PREDICTION_FAILED",
-                    "Async inference prediction failed",
-                    {
-                        "status": "failed",
-                        # "invocation_arn": invocation_arn,
-                        "output_id": output_id,
-                        "s3_failure_path": f"s3://{s3_bucket}/{failure_key}",
-                        "failure_time": failure_status.get("last_modified"),
-                        "error_details": failure_data,
-                    },
+                _failure_cache[failure_cache_key] = (failure_status, failure_data)
+                while len(_failure_cache) > RESULT_CACHE_MAX_ENTRIES:
+                    _failure_cache.popitem(last=False)
+
+                return _prediction_failed_response(
+                    output_id,
+                    f"s3://{s3_bucket}/{failure_key}",
+                    failure_status,
+                    failure_data,
+                    context,
+                    now_iso,
                 )
 
             except Exception as e:
@@ -377,7 +554,9 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if s3_warnings:
             in_progress_data["s3_warnings"] = s3_warnings
 
-        return _success_response(in_progress_data, "Prediction is still in progress")
+        return _success_response(
+            in_progress_data, "Prediction is still in progress", timestamp=now_iso
+        )
 
     except Exception as e:
         logger.error(f"Unexpected error in get_results: {str(e)}", exc_info=True)
@@ -387,282 +566,324 @@ def get_results(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
 
-def _check_s3_object_exists(s3_client, bucket: str, key: str) -> Dict[str, Any]:
+def _prediction_failed_response(
+    output_id: str,
+    s3_failure_path: str,
+    failure_status: Dict[str, Any],
+    failure_data: Any,
+    context: Any,
+    timestamp: str,
+) -> Dict[str, Any]:
+    """
+    Record a detected prediction failure and build its response.
+
+    Args:
+        output_id: Output ID of the failed prediction
+        s3_failure_path: S3 URI of the failure log
+        failure_status: Lookup status of the failure log
+        failure_data: Parsed failure details
+        context: Lambda context object
+        timestamp: ISO timestamp for the response
+
+    Returns:
+        PREDICTION_FAILED error response
+    """
+    # Record failure metrics
+    put_simple_metric("PredictionFailed", 1)
+
+    log_event(
+        "failure_detected",
+        {
+            "output_id": output_id,
+            "failure_time": failure_status.get("last_modified"),
+            "request_id": context.aws_request_id,
+        },
+    )
+
+    return _error_response(
+        "PREDICTION_FAILED",
+        "Async inference prediction failed",
+        {
+            "status": "failed",
+            # "invocation_arn": invocation_arn,
+            "output_id": output_id,
+            "s3_failure_path": s3_failure_path,
+            "failure_time": failure_status.get("last_modified"),
+            "error_details": failure_data,
+        },
+        timestamp=timestamp,
+    )
+
+
+def _try_get_object(
+    s3_client,
+    bucket: str,
+    key: str,
+    etag: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
     """
-    Check if an S3 object exists and get its metadata.
+    Fetch an S3 object in one request, treating a missing key as not yet available.
 
     Args:
         s3_client: Boto3 S3 client
         bucket: S3 bucket name
         key: S3 object key
+        etag: ETag of a previously fetched copy, making the GET conditional
+        max_bytes: If given, read only this many leading bytes of the body,
+            as stored, instead of the whole decompressed body
 
     Returns:
-        Dict with existence status and metadata
+        Dict with existence status and metadata, plus the decompressed body
+        when the object exists; not_modified is set instead of the body when
+        the object still matches etag, and too_large when the body exceeds
+        MAX_RESULT_BYTES
     """
+    request = {"Bucket": bucket, "Key": key}
+    if etag:
+        request["IfNoneMatch"] = f'"{etag}"'
     try:
-        response = s3_client.head_object(Bucket=bucket, Key=key)
-        return {
-            "exists": True,
-            "last_modified": (
-                response.get("LastModified", "").isoformat()
-                if response.get("LastModified")
-                else None
-            ),
-            "content_length": response.get("ContentLength", 0),
-            "etag": response.get("ETag", "").strip('"'),
-        }
+        response = s3_client.get_object(**request)
+        if max_bytes is not None:
+            return {
+                **_object_status(response),
+                "body": _read_object_prefix(response, max_bytes),
+            }
+        body = _read_object_body(response)
+        if body is None:
+            logger.warning(f"S3 object {bucket}/{key} exceeds {MAX_RESULT_BYTES} bytes")
+            return {**_object_status(response), "too_large": True}
+        return {**_object_status(response), "body": body}
     except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
-        error_message = e.response.get("Error", {}).get("Message", "")
+        if get_client_error_details(e)[0] == "304":
+            return {"exists": True, "not_modified": True}
+        return _s3_error_status(e, bucket, key)
+    except Exception as e:
+        return _s3_error_status(e, bucket, key)
+
+
+def _read_object_prefix(response: Dict[str, Any], max_bytes: int) -> bytes:
+    """Read at most max_bytes of a get_object response body and release the stream."""
+    stream = response["Body"]
+    try:
+        return stream.read(max_bytes)
+    finally:
+        stream.close()
+
+
+def _read_object_body(response: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Read and decompress a get_object response body within MAX_RESULT_BYTES.
+
+    Args:
+        response: get_object response
 
-        if error_code == "404" or error_code == "NoSuchKey":
+    Returns:
+        Decompressed body, or None when it is larger than MAX_RESULT_BYTES
+    """
+    if response.get("ContentLength", 0) > MAX_RESULT_BYTES:
+        # Skip the download; the stream is released with the response
+        response["Body"].close()
+        return None
+    body = response["Body"].read()
+    if response.get("ContentEncoding") == "gzip" or body[:2] == GZIP_MAGIC:
+        # Stop one byte past the cap so a highly compressible body is never
+        # expanded in full just to find out it is too large
+        decompressor = zlib.decompressobj(wbits=31)
+        body = decompressor.decompress(body, MAX_RESULT_BYTES + 1)
+        if decompressor.unconsumed_tail or len(body) > MAX_RESULT_BYTES:
+            return None
+        if not decompressor.eof:
+            raise EOFError("Compressed file ended before the end-of-stream marker")
+    return body
+
+
+def _cache_result(cache_key: str, status: Dict[str, Any], results_data: Any) -> None:
+    """
+    Remember parsed results for conditional GETs, evicting the least recently used.
+
+    Args:
+        cache_key: "bucket/key" of the results object
+        status: Lookup status of the fetched object, without its body
+        results_data: Parsed results
+    """
+    if not status.get("etag") or (
+        status.get("content_length", 0) > RESULT_CACHE_MAX_OBJECT_BYTES
+    ):
+        return
+    _result_cache[cache_key] = (status, results_data)
+    _result_cache.move_to_end(cache_key)
+    while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+def _object_status(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the existence status from a head_object or get_object response."""
+    return {
+        "exists": True,
+        "last_modified": (
+            response.get("LastModified", "").isoformat()
+            if response.get("LastModified")
+            else None
+        ),
+        "content_length": response.get("ContentLength", 0),
+        "etag": response.get("ETag", "").strip('"'),
+    }
+
+
+def _s3_error_status(error: Exception, bucket: str, key: str) -> Dict[str, Any]:
+    """
+    Classify an S3 object lookup error.
+
+    Args:
+        error: Exception raised by head_object or get_object
+        bucket: S3 bucket name
+        key: S3 object key
+
+    Returns:
+        Dict with existence status and, for anything but a missing key, error details
+    """
+    if isinstance(error, ClientError):
+        error_code, error_message = get_client_error_details(error)
+
+        if error_code in _S3_NOT_FOUND_CODES:
             # Object doesn't exist - this is expected for in-progress predictions
             return {"exists": False}
-        elif error_code == "403" or error_code == "AccessDenied":
-            # Access denied - permission issue
-            logger.error(f"Access denied to S3 object {bucket}/{key}: {error_message}")
-            return {
-                "exists": False,
-                "error": "ACCESS_DENIED",
-                "error_message": "Access denied to S3 object",
-            }
-        elif error_code == "NoSuchBucket":
-            # Bucket doesn't exist - configuration issue
-            logger.error(f"S3 bucket does not exist: {bucket}")
-            return {
-                "exists": False,
-                "error": "BUCKET_NOT_FOUND",
-                "error_message": f"S3 bucket '{bucket}' does not exist",
-            }
-        elif error_code in ["InvalidBucketName", "InvalidObjectName"]:
-            # Invalid names - configuration issue
-            logger.error(f"Invalid S3 bucket or key name: {bucket}/{key}")
-            return {
-                "exists": False,
-                "error": "INVALID_S3_NAME",
-                "error_message": "Invalid S3 bucket or object name",
-            }
-        elif error_code in ["RequestTimeout", "ServiceUnavailable", "SlowDown"]:
-            # Temporary S3 service issues
-            logger.warning(
-                f"Temporary S3 service issue for {bucket}/{key}: {error_code}"
+
+        lookup_error = _S3_LOOKUP_ERRORS.get(error_code)
+        if lookup_error:
+            # Permission, configuration or temporary service issue
+            status_error, status_message = lookup_error
+            log = (
+                logger.warning
+                if status_error == "S3_SERVICE_UNAVAILABLE"
+                else logger.error
             )
-            return {
-                "exists": False,
-                "error": "S3_SERVICE_UNAVAILABLE",
-                "error_message": "S3 service temporarily unavailable",
-            }
-        else:
-            # Other S3 error
-            logger.error(
-                f"S3 head_object error for {bucket}/{key}: {error_code} - {error_message}"
+            log(
+                f"S3 object lookup for {bucket}/{key} failed: {error_code} - {error_message}"
             )
             return {
                 "exists": False,
-                "error": error_code,
-                "error_message": error_message or "Unknown S3 error",
+                "error": status_error,
+                "error_message": status_message.format(bucket=bucket),
             }
 
-    except BotoCoreError as e:
-        logger.error(f"BotoCore error checking S3 object {bucket}/{key}: {str(e)}")
+        # Other S3 error
+        logger.error(
+            f"S3 object lookup error for {bucket}/{key}: {error_code} - {error_message}"
+        )
+        return {
+            "exists": False,
+            "error": error_code,
+            "error_message": error_message or "Unknown S3 error",
+        }
+
+    if isinstance(error, BotoCoreError):
+        logger.error(f"BotoCore error checking S3 object {bucket}/{key}: {str(error)}")
         return {
             "exists": False,
             "error": "BOTO_CONNECTION_ERROR",
             "error_message": "Failed to connect to S3 service",
         }
-    except Exception as e:
-        logger.error(f"Unexpected error checking S3 object {bucket}/{key}: {str(e)}")
-        return {"exists": False, "error": "UNKNOWN_ERROR", "error_message": str(e)}
 
+    logger.error(f"Unexpected error checking S3 object {bucket}/{key}: {str(error)}")
+    return {"exists": False, "error": "UNKNOWN_ERROR", "error_message": str(error)}
 
-def _retrieve_s3_results(s3_client, bucket: str, key: str) -> Dict[str, Any]:
+
+def _parse_s3_results(body: bytes, bucket: str, key: str) -> Dict[str, Any]:
     """
-    Retrieve and parse results from S3.
+    Parse a decompressed results object body.
 
     Args:
-        s3_client: Boto3 S3 client
+        body: Results object body
         bucket: S3 bucket name
         key: S3 object key
 
     Returns:
         Parsed results data
     """
+    # Validate content is not empty; isspace() scans in place where strip()
+    # would copy the whole payload
+    if not body or body.isspace():
+        logger.warning(f"Empty results file retrieved from {bucket}/{key}")
+        return {"raw_output": "", "warning": "Results file is empty"}
+
+    # Try to parse as JSON first. json.loads takes the bytes directly, so the
+    # payload is only decoded to text for the fallbacks below rather than
+    # copied on every successful parse.
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response["Body"].read().decode("utf-8")
-
-        # Validate content is not empty
-        if not content.strip():
-            logger.warning(f"Empty results file retrieved from {bucket}/{key}")
-            return {"raw_output": "", "warning": "Results file is empty"}
-
-        # Try to parse as JSON first
-        try:
-            results_data = json.loads(content)
-
-            # Validate that we have meaningful results
-            if not results_data:
-                logger.warning(f"Results from {bucket}/{key} parsed as empty JSON")
-                return {
-                    "raw_output": content,
-                    "warning": "Results parsed as empty JSON",
-                }
+        results_data = json.loads(body)
 
-            return results_data
-
-        except json.JSONDecodeError as json_error:
-            # If not JSON, return as text with parsing info
-            logger.warning(
-                f"Results from {bucket}/{key} are not valid JSON: {str(json_error)}"
-            )
+        # Validate that we have meaningful results
+        if not results_data:
+            logger.warning(f"Results from {bucket}/{key} parsed as empty JSON")
             return {
-                "raw_output": content,
-                "parsing_info": {
-                    "format": "text",
-                    "json_error": str(json_error),
-                    "content_length": len(content),
-                },
+                "raw_output": body.decode("utf-8"),
+                "warning": "Results parsed as empty JSON",
             }
 
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-
-        if error_code == "404" or error_code == "NoSuchKey":
-            logger.error(f"Results file disappeared during retrieval: {bucket}/{key}")
-            raise Exception("Results file no longer exists (may have been deleted)")
-        elif error_code == "403" or error_code == "AccessDenied":
-            logger.error(f"Access denied retrieving results: {bucket}/{key}")
-            raise Exception("Access denied to results file")
-        elif error_code in ["InvalidObjectName", "InvalidBucketName"]:
-            logger.error(f"Invalid S3 path for results: {bucket}/{key}")
-            raise Exception("Invalid S3 path for results file")
-        elif error_code in ["RequestTimeout", "ServiceUnavailable"]:
-            logger.error(f"S3 service timeout retrieving results: {bucket}/{key}")
-            raise Exception("S3 service timeout - please retry")
-        else:
+        return results_data
+
+    except (json.JSONDecodeError, UnicodeDecodeError) as json_error:
+        try:
+            content = body.decode("utf-8")
+        except UnicodeDecodeError as e:
             logger.error(
-                f"S3 ClientError retrieving results: {error_code} - {error_message}"
+                f"Unicode decode error for results file {bucket}/{key}: {str(e)}"
             )
-            raise Exception(f"S3 error retrieving results: {error_message}")
-
-    except BotoCoreError as e:
-        logger.error(f"BotoCore error retrieving results: {str(e)}")
-        raise Exception("Failed to connect to S3 service for results retrieval")
+            raise Exception("Results file contains invalid character encoding")
+        # Keep a single copy of the payload alive for the text fallback
+        del body
 
-    except UnicodeDecodeError as e:
-        logger.error(f"Unicode decode error for results file {bucket}/{key}: {str(e)}")
-        raise Exception("Results file contains invalid character encoding")
+        # If not JSON, return as text with parsing info
+        logger.warning(
+            f"Results from {bucket}/{key} are not valid JSON: {str(json_error)}"
+        )
+        return {
+            "raw_output": content,
+            "parsing_info": {
+                "format": "text",
+                "json_error": str(json_error),
+                "content_length": len(content),
+            },
+        }
 
     except Exception as e:
         logger.error(f"Unexpected error retrieving results: {str(e)}")
         raise Exception(f"Unexpected error retrieving results: {str(e)}")
 
 
-def _retrieve_s3_failure_details(s3_client, bucket: str, key: str) -> Dict[str, Any]:
+def _parse_s3_failure_details(
+    body: bytes,
+    bucket: str,
+    key: str,
+    retrieved_at: Optional[str] = None,
+    content_length: Optional[int] = None,
+) -> Dict[str, Any]:
     """
-    Retrieve and parse failure details from S3.
+    Parse a failure details object body.
 
     Args:
-        s3_client: Boto3 S3 client
+        body: Failure details object body, or up to FAILURE_MESSAGE_MAX_CHARS + 1
+            leading bytes of it
         bucket: S3 bucket name
         key: S3 object key
+        retrieved_at: ISO retrieval timestamp, defaulting to the current time
+        content_length: Size of the stored object in bytes, defaulting to the
+            number of bytes read
 
     Returns:
         Parsed failure details
     """
+    retrieved_at = retrieved_at or datetime.now(timezone.utc).isoformat()
+    truncated = len(body) > FAILURE_MESSAGE_MAX_CHARS
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response["Body"].read().decode("utf-8")
-
-        # Validate content is not empty
-        if not content.strip():
-            logger.warning(f"Empty failure details file retrieved from {bucket}/{key}")
-            return {
-                "error_message": "Prediction failed but no error details available",
-                "error_type": "empty_failure_log",
-                "raw_content": "",
-            }
-
-        # Try to parse as JSON first
-        try:
-            failure_data = json.loads(content)
-
-            # Enhance failure data with additional context
-            if isinstance(failure_data, dict):
-                failure_data["retrieval_info"] = {
-                    "retrieved_at": datetime.now(timezone.utc).isoformat(),
-                    "content_length": len(content),
-                    "format": "json",
-                }
-
-            return failure_data
-
-        except json.JSONDecodeError as json_error:
-            # If not JSON, return as text with basic structure and parsing info
-            logger.warning(
-                f"Failure details from {bucket}/{key} are not valid JSON: {str(json_error)}"
-            )
-            return {
-                "error_message": content,
-                "error_type": "text_format",
-                "parsing_info": {
-                    "json_error": str(json_error),
-                    "content_length": len(content),
-                    "format": "text",
-                },
-                "retrieval_info": {
-                    "retrieved_at": datetime.now(timezone.utc).isoformat()
-                },
-            }
-
-    except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
-
-        if error_code == "404" or error_code == "NoSuchKey":
-            logger.error(
-                f"Failure details file disappeared during retrieval: {bucket}/{key}"
-            )
-            return {
-                "error_message": "Prediction failed but failure details file no longer exists",
-                "error_type": "failure_log_missing",
-                "s3_error": error_code,
-            }
-        elif error_code == "403" or error_code == "AccessDenied":
-            logger.error(f"Access denied retrieving failure details: {bucket}/{key}")
-            return {
-                "error_message": "Prediction failed but access denied to failure details",
-                "error_type": "failure_log_access_denied",
-                "s3_error": error_code,
-            }
-        elif error_code in ["RequestTimeout", "ServiceUnavailable"]:
-            logger.error(
-                f"S3 service timeout retrieving failure details: {bucket}/{key}"
-            )
-            return {
-                "error_message": "Prediction failed and S3 service timeout retrieving failure details",
-                "error_type": "failure_log_service_timeout",
-                "s3_error": error_code,
-                "retry_suggested": True,
-            }
-        else:
-            logger.error(
-                f"S3 ClientError retrieving failure details: {error_code} - {error_message}"
-            )
-            return {
-                "error_message": f"Could not retrieve failure details: {error_message}",
-                "error_type": "s3_retrieval_error",
-                "s3_error": error_code,
-            }
-
-    except BotoCoreError as e:
-        logger.error(f"BotoCore error retrieving failure details: {str(e)}")
-        return {
-            "error_message": "Failed to connect to S3 service for failure details",
-            "error_type": "boto_connection_error",
-        }
-
+        # A truncated body may end inside a multi-byte character; the
+        # incremental decoder holds that partial character back instead of
+        # failing on it
+        content = codecs.getincrementaldecoder("utf-8")().decode(
+            body[:FAILURE_MESSAGE_MAX_CHARS], final=not truncated
+        )
     except UnicodeDecodeError as e:
         logger.error(
             f"Unicode decode error for failure details file {bucket}/{key}: {str(e)}"
@@ -673,11 +894,47 @@ def _retrieve_s3_failure_details(s3_client, bucket: str, key: str) -> Dict[str,
             "decode_error": str(e),
         }
 
-    except Exception as e:
-        logger.error(f"Unexpected error retrieving failure details: {str(e)}")
+    # Validate content is not empty
+    if not content or content.isspace():
+        logger.warning(f"Empty failure details file retrieved from {bucket}/{key}")
         return {
-            "error_message": f"Could not retrieve failure details: {str(e)}",
-            "error_type": "unexpected_retrieval_error",
+            "error_message": "Prediction failed but no error details available",
+            "error_type": "empty_failure_log",
+            "raw_content": "",
+        }
+
+    content_length = content_length or len(body)
+
+    # Try to parse as JSON first; a truncated body falls through to the text path
+    try:
+        failure_data = json.loads(content)
+
+        # Enhance failure data with additional context
+        if isinstance(failure_data, dict):
+            failure_data["retrieval_info"] = {
+                "retrieved_at": retrieved_at,
+                "content_length": content_length,
+                "format": "json",
+            }
+
+        return failure_data
+
+    except json.JSONDecodeError as json_error:
+        # If not JSON, return as text with basic structure and parsing info
+        logger.warning(
+            f"Failure details from {bucket}/{key} are not valid JSON: {str(json_error)}"
+        )
+        # Return a bounded preview so large logs are not echoed back in full
+        return {
+            "error_message": content,
+            "error_type": "text_format",
+            "parsing_info": {
+                "json_error": str(json_error),
+                "content_length": content_length,
+                "format": "text",
+                "truncated": truncated,
+            },
+            "retrieval_info": {"retrieved_at": retrieved_at},
         }
 
 
@@ -705,13 +962,16 @@ def _retrieve_s3_failure_details(s3_client, bucket: str, key: str) -> Dict[str,
 #         return None
 
 
-def _success_response(data: Dict[str, Any], message: str = "Success") -> Dict[str, Any]:
+def _success_response(
+    data: Dict[str, Any], message: str = "Success", timestamp: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Create standardized success response format.
 
     Args:
         data: Response data
         message: Success message
+        timestamp: ISO timestamp for the response, defaulting to the current time
 
     Returns:
         Standardized success response dictionary
@@ -720,12 +980,15 @@ def _success_response(data: Dict[str, Any], message: str = "Success") -> Dict[st
         "success": True,
         "message": message,
         "data": data,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
     }
 
 
 def _error_response(
-    error_code: str, message: str, details: Optional[Dict[str, Any]] = None
+    error_code: str,
+    message: str,
+    details: Optional[Dict[str, Any]] = None,
+    timestamp: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Create standardized error response format.
@@ -734,6 +997,7 @@ def _error_response(
         error_code: Error code identifier
         message: Error message
         details: Additional error details
+        timestamp: ISO timestamp for the response, defaulting to the current time
 
     Returns:
         Standardized error response dictionary
@@ -742,7 +1006,7 @@ def _error_response(
         "success": False,
         "error_code": error_code,
         "message": message,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
     }
 
     if details:
@@ -778,7 +1042,7 @@ def _validate_s3_configuration(
         errors.append("S3 bucket name must be a non-empty string")
     elif len(bucket) < 3 or len(bucket) > 63:
         errors.append("S3 bucket name must be between 3 and 63 characters")
-    elif not re.match(r"^[a-z0-9][a-z0-9\-]*[a-z0-9]$", bucket):
+    elif not _BUCKET_RE.match(bucket):
         errors.append("S3 bucket name contains invalid characters")
 
     # Validate prefixes
@@ -819,30 +1083,29 @@ def _validate_s3_bucket_access(s3_client, bucket: str) -> Dict[str, Any]:
         Dict with accessibility results
     """
     try:
-        # Try to list objects in the bucket (with limit to minimize cost)
-        s3_client.list_objects_v2(Bucket=bucket, MaxKeys=1)
+        # A single HEAD request, with no listing to return or parse
+        s3_client.head_bucket(Bucket=bucket)
 
         return {"is_accessible": True, "error_code": None, "error_message": None}
 
     except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "Unknown")
-        error_message = e.response.get("Error", {}).get("Message", str(e))
+        error_code, error_message = get_client_error_details(e)
 
-        if error_code == "NoSuchBucket":
+        if error_code in _S3_BUCKET_NOT_FOUND_CODES:
             return {
                 "is_accessible": False,
                 "error_code": "BUCKET_NOT_FOUND",
                 "error_message": f"S3 bucket '{bucket}' does not exist",
                 "details": {"s3_error": error_code},
             }
-        elif error_code == "403" or error_code == "AccessDenied":
+        elif error_code in _S3_ACCESS_DENIED_CODES:
             return {
                 "is_accessible": False,
                 "error_code": "BUCKET_ACCESS_DENIED",
                 "error_message": f"Access denied to S3 bucket '{bucket}'",
                 "details": {"s3_error": error_code},
             }
-        elif error_code in ["InvalidBucketName", "InvalidRequest"]:
+        elif error_code in _S3_INVALID_BUCKET_CODES:
             return {
                 "is_accessible": False,
                 "error_code": "INVALID_BUCKET_NAME",
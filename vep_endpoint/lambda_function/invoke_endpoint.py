@@ -8,15 +8,16 @@ This module handles the invocation of SageMaker async inference endpoints
 with protein sequence data.
 """
 
+import concurrent.futures
 import json
 import logging
 import os
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
-import re
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 
 from validators import (
@@ -24,11 +25,72 @@ from validators import (
     validate_event_structure,
     create_validation_error_response,
     get_cleaned_sequence,
+    get_client_error_details,
 )
-from cloudwatch_integration import put_simple_metric, log_event
+from cloudwatch_integration import put_batch_metrics, put_simple_metric, log_event
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections, bounded timeouts and adaptive retries so transient
+# SageMaker or S3 throttling is retried without a full re-invocation
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
+
+# Runs the input upload while the endpoint invocation is prepared
+_UPLOAD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+# AWS clients created once per container at import, during the Lambda init
+# phase, and reused across warm invocations
+try:
+    _sagemaker_client = boto3.client("sagemaker-runtime", config=CLIENT_CONFIG)
+    _s3_client = boto3.client("s3", config=CLIENT_CONFIG)
+except Exception as e:
+    logger.warning("Deferring AWS client creation: %s", e)
+    _sagemaker_client = None
+    _s3_client = None
+
+
+def _get_clients():
+    """Get SageMaker runtime and S3 clients, creating any that import-time creation missed."""
+    global _sagemaker_client, _s3_client
+    if _sagemaker_client is None:
+        _sagemaker_client = boto3.client("sagemaker-runtime", config=CLIENT_CONFIG)
+    if _s3_client is None:
+        _s3_client = boto3.client("s3", config=CLIENT_CONFIG)
+    return _sagemaker_client, _s3_client
+
+
+# Endpoint and S3 settings from the environment, which does not change during
+# a Lambda container's lifetime; read once by _get_endpoint_settings()
+_endpoint_settings: Optional[Dict[str, Optional[str]]] = None
+
+
+def _get_endpoint_settings() -> Dict[str, Optional[str]]:
+    """
+    Get the endpoint name, S3 bucket and prefixes, reading the environment once.
+
+    Returns:
+        Dict with endpoint_name, bucket, input_prefix and output_prefix keys
+    """
+    global _endpoint_settings
+    if _endpoint_settings is None:
+        _endpoint_settings = {
+            "endpoint_name": os.environ.get("SAGEMAKER_ENDPOINT_NAME"),
+            "bucket": os.environ.get("S3_BUCKET_NAME"),
+            "input_prefix": os.environ.get(
+                "S3_INPUT_PREFIX", "async-inference-input"
+            ).rstrip("/"),
+            "output_prefix": os.environ.get(
+                "S3_OUTPUT_PREFIX", "async-inference-output"
+            ).rstrip("/"),
+        }
+    return _endpoint_settings
+
 
 def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -42,6 +104,7 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dict containing invocation response or error information
     """
     start_time = datetime.now(timezone.utc)
+    now_iso = start_time.isoformat()
 
     try:
         # Log the invocation request
@@ -76,12 +139,14 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Get cleaned sequence for processing
         cleaned_sequence = get_cleaned_sequence(raw_sequence)
+        sequence_length = len(cleaned_sequence)
 
         # Get environment variables
-        endpoint_name = os.environ.get("SAGEMAKER_ENDPOINT_NAME")
-        s3_bucket = os.environ.get("S3_BUCKET_NAME")
-        s3_input_prefix = os.environ.get("S3_INPUT_PREFIX", "async-inference-input")
-        s3_output_prefix = os.environ.get("S3_OUTPUT_PREFIX", "async-inference-output")
+        settings = _get_endpoint_settings()
+        endpoint_name = settings["endpoint_name"]
+        s3_bucket = settings["bucket"]
+        s3_input_prefix = settings["input_prefix"]
+        s3_output_prefix = settings["output_prefix"]
 
         if not endpoint_name:
             put_simple_metric("ConfigurationError", 1)
@@ -99,10 +164,9 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Initialize AWS clients
         try:
-            sagemaker_client = boto3.client("sagemaker-runtime")
-            s3_client = boto3.client("s3")
+            sagemaker_client, s3_client = _get_clients()
         except Exception as e:
-            logger.error(f"Failed to initialize AWS clients: {str(e)}")
+            logger.error("Failed to initialize AWS clients: %s", e)
             put_simple_metric("ClientError", 1)
             return _error_response(
                 "CLIENT_INITIALIZATION_ERROR", "Failed to initialize AWS clients"
@@ -112,37 +176,49 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         input_data = {"sequence": cleaned_sequence}
 
         # Generate unique invocation ID for tracking
-        invocation_id = str(uuid.uuid4())
+        invocation_id = uuid.uuid4().hex
 
-        # Construct S3 paths
-        s3_input_key = f"{s3_input_prefix.rstrip('/')}/{invocation_id}.json"
+        # Construct S3 paths; prefixes are already stripped by _get_endpoint_settings()
+        s3_input_key = f"{s3_input_prefix}/{invocation_id}.json"
         s3_input_path = f"s3://{s3_bucket}/{s3_input_key}"
-        s3_output_path = (
-            f"s3://{s3_bucket}/{s3_output_prefix.rstrip('/')}/{invocation_id}.out"
-        )
+        s3_output_path = f"s3://{s3_bucket}/{s3_output_prefix}/{invocation_id}.out"
 
-        # Upload input data to S3 first (required for async inference)
+        # Upload input data to S3 first (required for async inference). Inputs
+        # are capped at 10,000 residues (about 10 KB of JSON), far below any
+        # multipart threshold, so a single put_object is the cheapest upload.
         try:
             input_json = json.dumps(input_data)
-            s3_client.put_object(
+            upload_future = _UPLOAD_POOL.submit(
+                s3_client.put_object,
                 Bucket=s3_bucket,
                 Key=s3_input_key,
                 Body=input_json,
                 ContentType="application/json",
             )
-            logger.info(f"Successfully uploaded input data to S3: {s3_input_path}")
+
+            # Prepare the invocation attributes while the upload is in flight;
+            # the endpoint is only invoked once the input exists
+            custom_attributes = json.dumps(
+                {
+                    "invocation_id": invocation_id,
+                    "sequence_length": sequence_length,
+                    "timestamp": now_iso,
+                }
+            )
+
+            upload_future.result()
+            logger.info("Successfully uploaded input data to S3: %s", s3_input_path)
 
         except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            error_message = e.response.get("Error", {}).get("Message", str(e))
-            logger.error(f"S3 upload error: {error_code} - {error_message}")
+            error_code, error_message = get_client_error_details(e)
+            logger.error("S3 upload error: %s - %s", error_code, error_message)
             put_simple_metric("S3Error", 1)
             return _error_response(
                 "S3_UPLOAD_ERROR", f"Failed to upload input data to S3: {error_message}"
             )
 
         except Exception as e:
-            logger.error(f"Unexpected error uploading to S3: {str(e)}")
+            logger.error("Unexpected error uploading to S3: %s", e)
             put_simple_metric("S3Error", 1)
             return _error_response(
                 "S3_UPLOAD_ERROR",
@@ -156,7 +232,7 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 {
                     "endpoint_name": endpoint_name,
                     "invocation_id": invocation_id,
-                    "sequence_length": len(cleaned_sequence),
+                    "sequence_length": sequence_length,
                     "s3_input_path": s3_input_path,
                     "s3_output_path": s3_output_path,
                     "request_id": context.aws_request_id,
@@ -166,24 +242,19 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             response = sagemaker_client.invoke_endpoint_async(
                 EndpointName=endpoint_name,
                 ContentType="application/json",
-                Accept="application/json",
+                # Gzip-compressed JSON; get_results detects and inflates it
+                Accept="application/json+gzip",
                 InputLocation=s3_input_path,
                 InvocationTimeoutSeconds=3600,  # 1 hour timeout
                 RequestTTLSeconds=21600,  # 6 hours TTL
-                CustomAttributes=json.dumps(
-                    {
-                        "invocation_id": invocation_id,
-                        "sequence_length": len(cleaned_sequence),
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    }
-                ),
+                CustomAttributes=custom_attributes,
             )
 
             # Parse successful response
             # invocation_arn = response.get('InferenceId')
             invocation_id = invocation_arn = response.get("InferenceId")
             output_location = response.get("OutputLocation", s3_output_path)
-            output_id = re.search(r".*\/(.*)\.out", output_location).group(1)
+            output_id = output_location.rpartition("/")[2].removesuffix(".out")
 
             # if not invocation_arn:
             if not invocation_id:
@@ -194,16 +265,17 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 )
 
             # Calculate invocation duration
-            invocation_duration_ms = (
-                datetime.now(timezone.utc) - start_time
-            ).total_seconds() * 1000
+            end_time = datetime.now(timezone.utc)
+            invocation_duration_ms = (end_time - start_time).total_seconds() * 1000
 
             # Record success metrics
-            put_simple_metric("InvocationSuccess", 1)
-            put_simple_metric(
-                "InvocationDuration", invocation_duration_ms, "Milliseconds"
+            put_batch_metrics(
+                [
+                    ("InvocationSuccess", 1, "Count"),
+                    ("InvocationDuration", invocation_duration_ms, "Milliseconds"),
+                    ("SequenceLength", sequence_length, "Count"),
+                ]
             )
-            put_simple_metric("SequenceLength", len(cleaned_sequence))
 
             # Log successful invocation
             log_event(
@@ -212,7 +284,7 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "s3_output_path": output_location,
                     "output_id": output_id,
                     "invocation_id": invocation_id,
-                    "sequence_length": len(cleaned_sequence),
+                    "sequence_length": sequence_length,
                     "endpoint_name": endpoint_name,
                     "duration_ms": invocation_duration_ms,
                     "request_id": context.aws_request_id,
@@ -224,19 +296,17 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 {
                     "s3_output_path": output_location,
                     "output_id": output_id,
-                    "sequence_length": len(cleaned_sequence),
-                    "estimated_completion_time": _estimate_completion_time(
-                        len(cleaned_sequence)
-                    ),
+                    "sequence_length": sequence_length,
+                    "estimated_completion_time": _estimate_completion_time(sequence_length),
                 },
                 "Async inference request submitted successfully",
+                timestamp=end_time.isoformat(),
             )
 
         except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            error_message = e.response.get("Error", {}).get("Message", str(e))
+            error_code, error_message = get_client_error_details(e)
 
-            logger.error(f"SageMaker ClientError: {error_code} - {error_message}")
+            logger.error("SageMaker ClientError: %s - %s", error_code, error_message)
 
             # Map specific SageMaker errors to user-friendly messages and record metrics
             put_simple_metric("SageMakerError", 1)
@@ -265,7 +335,7 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 )
 
         except BotoCoreError as e:
-            logger.error(f"BotoCore error during SageMaker invocation: {str(e)}")
+            logger.error("BotoCore error during SageMaker invocation: %s", e)
             put_simple_metric("ConnectionError", 1)
             return _error_response(
                 "AWS_CONNECTION_ERROR", "Failed to connect to AWS services"
@@ -273,7 +343,7 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         except Exception as e:
             logger.error(
-                f"Unexpected error during SageMaker invocation: {str(e)}", exc_info=True
+                "Unexpected error during SageMaker invocation: %s", e, exc_info=True
             )
             put_simple_metric("UnexpectedError", 1)
             return _error_response(
@@ -282,20 +352,23 @@ def invoke_endpoint(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             )
 
     except Exception as e:
-        logger.error(f"Unexpected error in invoke_endpoint: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in invoke_endpoint: %s", e, exc_info=True)
         put_simple_metric("UnexpectedError", 1)
         return _error_response(
             "INVOKE_ENDPOINT_ERROR", f"Unexpected error in invoke_endpoint: {str(e)}"
         )
 
 
-def _success_response(data: Dict[str, Any], message: str = "Success") -> Dict[str, Any]:
+def _success_response(
+    data: Dict[str, Any], message: str = "Success", timestamp: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Create standardized success response format.
 
     Args:
         data: Response data
         message: Success message
+        timestamp: ISO timestamp to report; defaults to the current time
 
     Returns:
         Standardized success response dictionary
@@ -304,12 +377,15 @@ def _success_response(data: Dict[str, Any], message: str = "Success") -> Dict[st
         "success": True,
         "message": message,
         "data": data,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
     }
 
 
 def _error_response(
-    error_code: str, message: str, details: Optional[Dict[str, Any]] = None
+    error_code: str,
+    message: str,
+    details: Optional[Dict[str, Any]] = None,
+    timestamp: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Create standardized error response format.
@@ -318,6 +394,7 @@ def _error_response(
         error_code: Error code identifier
         message: Error message
         details: Additional error details
+        timestamp: ISO timestamp to report; defaults to the current time
 
     Returns:
         Standardized error response dictionary
@@ -326,7 +403,7 @@ def _error_response(
         "success": False,
         "error_code": error_code,
         "message": message,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
     }
 
     if details:
@@ -357,8 +434,6 @@ def _estimate_completion_time(sequence_length: int) -> str:
     # Simple estimation: ~1 minute per 600 amino acids, minimum 1 minutes
     estimated_minutes = max(1, sequence_length // 600 + 1)
 
-    from datetime import timedelta
-
     estimated_completion = datetime.now(timezone.utc) + timedelta(
         minutes=estimated_minutes
     )
@@ -9,14 +9,30 @@ tool-based requests for invoking SageMaker async endpoints and retrieving result
 """
 
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
-from cloudwatch_integration import put_simple_metric, log_event
+from cloudwatch_integration import (
+    flush_metrics,
+    log_event,
+    put_simple_metric,
+)
 
-# Configure logging
+# Tool modules are imported at load so their AWS clients are created during
+# the Lambda init phase rather than in the first billed invocation
+from get_results import get_results
+from invoke_endpoint import invoke_endpoint
+
+# Configure logging; LOG_LEVEL is set on the function by the stack
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+# Tool name to handler mapping used by lambda_handler
+_TOOL_HANDLERS = {
+    "invoke_endpoint": invoke_endpoint,
+    "get_results": get_results,
+}
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -54,22 +70,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             )
 
         # Route to appropriate method based on tool name
-        if tool_name == "invoke_endpoint":
-            from invoke_endpoint import invoke_endpoint
-            result = invoke_endpoint(event, context)
-            
-        elif tool_name == "get_results":
-            from get_results import get_results
-            result = get_results(event, context)
-            
-        else:
+        handler = _TOOL_HANDLERS.get(tool_name)
+        if handler is None:
             put_simple_metric("InvocationError", 1)
             return _error_response(
                 "UNKNOWN_TOOL",
-                f"Unknown tool: {tool_name}. Supported tools are: invoke_endpoint, get_results",
+                f"Unknown tool: {tool_name}. Supported tools are: {', '.join(_TOOL_HANDLERS)}",
                 context,
             )
 
+        result = handler(event, context)
+
         # Record duration
         duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
         put_simple_metric("Duration", duration_ms, "Milliseconds")
@@ -91,6 +102,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             context
         )
 
+    finally:
+        # Lambda may freeze the environment after returning, so send the
+        # buffered metrics before the response goes out
+        flush_metrics()
+
 
 def _extract_tool_name(context: Any) -> Optional[str]:
     """
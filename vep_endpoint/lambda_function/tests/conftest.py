@@ -12,9 +12,29 @@ sys.path.insert(0, str(lambda_function_dir))
 
 import pytest
 import boto3
-from moto import mock_s3, mock_sagemaker, mock_cloudwatch
+from botocore.stub import Stubber
+from moto import mock_aws
 from unittest.mock import Mock, MagicMock
 
+import cloudwatch_integration
+import get_results
+import invoke_endpoint
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state(monkeypatch):
+    """Drop module-level AWS clients, cached settings and buffered metrics between tests."""
+    monkeypatch.setattr(invoke_endpoint, "_sagemaker_client", None)
+    monkeypatch.setattr(invoke_endpoint, "_s3_client", None)
+    monkeypatch.setattr(invoke_endpoint, "_endpoint_settings", None)
+    monkeypatch.setattr(get_results, "_s3_client", None)
+    monkeypatch.setattr(get_results, "_s3_settings", None)
+    monkeypatch.setattr(get_results, "_bucket_access_cache", {})
+    monkeypatch.setattr(get_results, "_result_cache", get_results.OrderedDict())
+    monkeypatch.setattr(get_results, "_failure_cache", get_results.OrderedDict())
+    monkeypatch.setattr(cloudwatch_integration, "_metric_buffer", cloudwatch_integration._MetricBuffer())
+    monkeypatch.setattr(cloudwatch_integration, "_metric_dimensions", None)
+
 
 @pytest.fixture
 def mock_lambda_context():
@@ -93,7 +113,7 @@ def mock_environment_variables(monkeypatch):
 @pytest.fixture
 def mock_s3_setup():
     """Set up mock S3 environment."""
-    with mock_s3():
+    with mock_aws():
         s3_client = boto3.client('s3', region_name='us-east-1')
         bucket_name = 'test-bucket'
         
@@ -103,10 +123,29 @@ def mock_s3_setup():
         yield s3_client, bucket_name
 
 
+@pytest.fixture(scope="session")
+def s3_stub_client():
+    """Real S3 client for Stubber-backed tests, created once per session."""
+    return boto3.client(
+        's3',
+        region_name='us-east-1',
+        aws_access_key_id='testing',
+        aws_secret_access_key='testing',
+    )
+
+
+@pytest.fixture
+def s3_stubber(s3_stub_client):
+    """Activate a Stubber on the shared S3 client for a single test."""
+    with Stubber(s3_stub_client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
 @pytest.fixture
 def mock_sagemaker_setup():
     """Set up mock SageMaker environment."""
-    with mock_sagemaker():
+    with mock_aws():
         sagemaker_client = boto3.client('sagemaker-runtime', region_name='us-east-1')
         yield sagemaker_client
 
@@ -114,6 +153,6 @@ def mock_sagemaker_setup():
 @pytest.fixture
 def mock_cloudwatch_setup():
     """Set up mock CloudWatch environment."""
-    with mock_cloudwatch():
+    with mock_aws():
         cloudwatch_client = boto3.client('cloudwatch', region_name='us-east-1')
         yield cloudwatch_client
\ No newline at end of file
@@ -4,10 +4,13 @@ Unit tests for cloudwatch_integration module.
 
 import pytest
 import json
+from datetime import datetime, timezone
 from unittest.mock import Mock, patch, MagicMock
 from cloudwatch_integration import (
     get_cloudwatch_client,
     put_simple_metric,
+    put_batch_metrics,
+    flush_metrics,
     log_event
 )
 
@@ -28,7 +31,9 @@ class TestGetCloudWatchClient:
         client = get_cloudwatch_client()
         
         assert client == mock_client
-        mock_boto_client.assert_called_once_with('cloudwatch')
+        mock_boto_client.assert_called_once_with(
+            'cloudwatch', config=cloudwatch_integration.CLIENT_CONFIG
+        )
 
     @patch('cloudwatch_integration.boto3.client')
     def test_get_cloudwatch_client_cached(self, mock_boto_client):
@@ -47,7 +52,9 @@ class TestGetCloudWatchClient:
         
         assert client1 == client2
         # Should only be called once due to caching
-        mock_boto_client.assert_called_once_with('cloudwatch')
+        mock_boto_client.assert_called_once_with(
+            'cloudwatch', config=cloudwatch_integration.CLIENT_CONFIG
+        )
 
     @patch('cloudwatch_integration.boto3.client')
     @patch('cloudwatch_integration.logger')
@@ -65,18 +72,58 @@ class TestGetCloudWatchClient:
         mock_logger.warning.assert_called_once()
 
 
+    def test_cloudwatch_client_compresses_metric_batches(self):
+        """Test a flushed batch of metrics is sent gzip-compressed."""
+        import boto3
+        import cloudwatch_integration
+
+        class _RequestCaptured(Exception):
+            pass
+
+        client = boto3.client(
+            'cloudwatch',
+            region_name='us-east-1',
+            aws_access_key_id='testing',
+            aws_secret_access_key='testing',
+            config=cloudwatch_integration.CLIENT_CONFIG,
+        )
+        captured = {}
+
+        def capture(request, **kwargs):
+            captured["encoding"] = request.headers.get("Content-Encoding")
+            raise _RequestCaptured()
+
+        client.meta.events.register('before-send.cloudwatch.PutMetricData', capture)
+
+        metric_data = [
+            {
+                'MetricName': f'Metric{i}',
+                'Value': 1.0,
+                'Unit': 'Count',
+                'Dimensions': [{'Name': 'FunctionName', 'Value': 'test-lambda-function'}],
+            }
+            for i in range(cloudwatch_integration.METRIC_FLUSH_THRESHOLD)
+        ]
+        with pytest.raises(_RequestCaptured):
+            client.put_metric_data(
+                Namespace=cloudwatch_integration.METRIC_NAMESPACE, MetricData=metric_data
+            )
+
+        assert captured["encoding"] == b"gzip"
+
+
 class TestPutSimpleMetric:
     """Test CloudWatch metric publishing."""
 
     @patch('cloudwatch_integration.get_cloudwatch_client')
-    @patch('cloudwatch_integration.os.environ.get')
-    def test_put_simple_metric_success(self, mock_env_get, mock_get_client):
+    def test_put_simple_metric_success(self, mock_get_client, monkeypatch):
         """Test successful metric publishing."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        mock_env_get.return_value = "test-function"
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "test-function")
         
         put_simple_metric("TestMetric", 1.0, "Count")
+        flush_metrics()
         
         mock_client.put_metric_data.assert_called_once()
         call_args = mock_client.put_metric_data.call_args[1]
@@ -99,6 +146,7 @@ class TestPutSimpleMetric:
         
         # Should not raise exception
         put_simple_metric("TestMetric", 1.0)
+        flush_metrics()
 
     @patch('cloudwatch_integration.get_cloudwatch_client')
     @patch('cloudwatch_integration.logger')
@@ -109,53 +157,143 @@ class TestPutSimpleMetric:
         mock_get_client.return_value = mock_client
         
         put_simple_metric("TestMetric", 1.0)
+        flush_metrics()
         
         mock_logger.warning.assert_called_once()
 
     @patch('cloudwatch_integration.get_cloudwatch_client')
-    @patch('cloudwatch_integration.os.environ.get')
-    def test_put_simple_metric_default_unit(self, mock_env_get, mock_get_client):
+    def test_put_simple_metric_default_unit(self, mock_get_client, monkeypatch):
         """Test metric publishing with default unit."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        mock_env_get.return_value = "test-function"
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "test-function")
         
         put_simple_metric("TestMetric", 5.0)
+        flush_metrics()
         
         call_args = mock_client.put_metric_data.call_args[1]
         metric_data = call_args['MetricData'][0]
         assert metric_data['Unit'] == 'Count'
 
     @patch('cloudwatch_integration.get_cloudwatch_client')
-    @patch('cloudwatch_integration.os.environ.get')
-    def test_put_simple_metric_custom_unit(self, mock_env_get, mock_get_client):
+    def test_put_simple_metric_custom_unit(self, mock_get_client, monkeypatch):
         """Test metric publishing with custom unit."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        mock_env_get.return_value = "test-function"
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "test-function")
         
         put_simple_metric("TestMetric", 100.0, "Milliseconds")
+        flush_metrics()
         
         call_args = mock_client.put_metric_data.call_args[1]
         metric_data = call_args['MetricData'][0]
         assert metric_data['Unit'] == 'Milliseconds'
 
     @patch('cloudwatch_integration.get_cloudwatch_client')
-    @patch('cloudwatch_integration.os.environ.get')
-    def test_put_simple_metric_unknown_function(self, mock_env_get, mock_get_client):
+    def test_put_simple_metric_unknown_function(self, mock_get_client, monkeypatch):
         """Test metric publishing when function name is unknown."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        # Mock os.environ.get to return 'unknown' as the default value
-        mock_env_get.return_value = 'unknown'
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
         
         put_simple_metric("TestMetric", 1.0)
+        flush_metrics()
         
         call_args = mock_client.put_metric_data.call_args[1]
         metric_data = call_args['MetricData'][0]
         assert metric_data['Dimensions'][0]['Value'] == 'unknown'
 
 
+class TestMetricBatching:
+    """Test buffering of metrics into batched CloudWatch calls."""
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_metrics_buffered_until_flush(self, mock_get_client):
+        """Test metrics are sent together in a single call on flush."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        put_simple_metric("MetricA", 1.0)
+        put_simple_metric("MetricB", 2.0)
+        mock_client.put_metric_data.assert_not_called()
+
+        flush_metrics()
+
+        mock_client.put_metric_data.assert_called_once()
+        metric_data = mock_client.put_metric_data.call_args[1]['MetricData']
+        assert [m['MetricName'] for m in metric_data] == ["MetricA", "MetricB"]
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_metrics_flushed_at_threshold(self, mock_get_client):
+        """Test the buffer flushes itself once the threshold is reached."""
+        import cloudwatch_integration
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        for i in range(cloudwatch_integration.METRIC_FLUSH_THRESHOLD):
+            put_simple_metric(f"Metric{i}", 1.0)
+
+        mock_client.put_metric_data.assert_called_once()
+        metric_data = mock_client.put_metric_data.call_args[1]['MetricData']
+        assert len(metric_data) == cloudwatch_integration.METRIC_FLUSH_THRESHOLD
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_put_batch_metrics(self, mock_get_client):
+        """Test several metrics queued together are sent in one call."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        put_batch_metrics([("MetricA", 1, "Count"), ("MetricB", 2.5, "Milliseconds")])
+        mock_client.put_metric_data.assert_not_called()
+
+        flush_metrics()
+
+        mock_client.put_metric_data.assert_called_once()
+        metric_data = mock_client.put_metric_data.call_args[1]['MetricData']
+        assert [(m['MetricName'], m['Value'], m['Unit']) for m in metric_data] == [
+            ("MetricA", 1, "Count"),
+            ("MetricB", 2.5, "Milliseconds"),
+        ]
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_flush_splits_at_request_limit(self, mock_get_client):
+        """Test a flush larger than one request's limit is split across calls."""
+        import cloudwatch_integration
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        put_batch_metrics([(f"Metric{i}", 1.0, "Count") for i in range(1500)])
+        flush_metrics()
+
+        assert mock_client.put_metric_data.call_count == 2
+        sizes = [
+            len(call[1]['MetricData'])
+            for call in mock_client.put_metric_data.call_args_list
+        ]
+        assert sizes == [cloudwatch_integration.MAX_METRICS_PER_REQUEST, 500]
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_metrics_keep_recorded_timestamp(self, mock_get_client):
+        """Test each datum carries the time it was recorded, not the flush time."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        before = datetime.now(timezone.utc)
+        put_simple_metric("MetricA", 1.0)
+        after = datetime.now(timezone.utc)
+        flush_metrics()
+
+        datum = mock_client.put_metric_data.call_args[1]['MetricData'][0]
+        assert before <= datum['Timestamp'] <= after
+
+    @patch('cloudwatch_integration.get_cloudwatch_client')
+    def test_flush_with_empty_buffer(self, mock_get_client):
+        """Test flushing an empty buffer makes no CloudWatch call."""
+        flush_metrics()
+
+        mock_get_client.assert_not_called()
+
+
 class TestLogEvent:
     """Test structured event logging."""
 
@@ -213,4 +351,13 @@ class TestLogEvent:
         mock_logger.info.assert_called_once()
         # Should not raise JSON encoding errors
         logged_data = json.loads(mock_logger.info.call_args[0][0])
-        assert logged_data["data"]["message"] == "Test with special chars: àáâãäå"
\ No newline at end of file
+        assert logged_data["data"]["message"] == "Test with special chars: àáâãäå"
+
+    @patch('cloudwatch_integration.logger')
+    def test_log_event_skipped_when_info_disabled(self, mock_logger):
+        """Test nothing is serialized when INFO records would be dropped."""
+        mock_logger.isEnabledFor.return_value = False
+        
+        log_event("test_event", {"key": "value"})
+        
+        mock_logger.info.assert_not_called()
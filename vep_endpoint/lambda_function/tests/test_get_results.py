@@ -3,14 +3,22 @@ Unit tests for get_results module.
 """
 
 import pytest
+import gzip
+import io
 import json
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from botocore.exceptions import ClientError, BotoCoreError
+from botocore.response import StreamingBody
+import get_results as get_results_module
 from get_results import (
+    FAILURE_MESSAGE_MAX_CHARS,
+    MAX_RESULT_BYTES,
     get_results,
-    _check_s3_object_exists,
-    _retrieve_s3_results,
-    _retrieve_s3_failure_details,
+    _try_get_object,
+    _get_s3_settings,
+    _parse_s3_results,
+    _parse_s3_failure_details,
     _success_response,
     _error_response,
     _validate_s3_configuration,
@@ -33,21 +41,30 @@ class TestGetResults:
             mock_boto_client.return_value = mock_s3
             
             # Mock successful result exists
-            with patch('get_results._check_s3_object_exists') as mock_check:
-                mock_check.return_value = {
+            with patch('get_results._try_get_object') as mock_get:
+                mock_get.return_value = {
                     "exists": True,
-                    "last_modified": "2023-01-01T00:00:00Z"
+                    "last_modified": "2023-01-01T00:00:00Z",
+                    "content_length": 29,
+                    "body": b'{"prediction": "result_data"}'
                 }
                 
-                with patch('get_results._retrieve_s3_results') as mock_retrieve:
-                    mock_retrieve.return_value = {"prediction": "result_data"}
-                    
-                    result = get_results(event, mock_lambda_context)
-                    
-                    assert result["success"] is True
-                    assert result["data"]["status"] == "completed"
-                    assert result["data"]["results"] == {"prediction": "result_data"}
-                    mock_put_metric.assert_any_call("ResultsRetrievalSuccess", 1)
+                result = get_results(event, mock_lambda_context)
+                
+                assert result["success"] is True
+                assert result["data"]["status"] == "completed"
+                assert result["data"]["results"] == {"prediction": "result_data"}
+                assert result["data"]["completion_time"] == "2023-01-01T00:00:00Z"
+                mock_put_metric.assert_any_call("ResultsRetrievalSuccess", 1)
+                mock_put_metric.assert_any_call("ResultsSize", 29, "Bytes")
+                # Results come from a single GET of the output key; the
+                # speculative failure GET may be cancelled before it starts
+                keys = [call.args[2] for call in mock_get.call_args_list]
+                assert keys.count("async-inference-output/test-output-123.out") == 1
+                assert set(keys) <= {
+                    "async-inference-output/test-output-123.out",
+                    "async-inference-failures/test-output-123.out",
+                }
 
     @patch('get_results.put_simple_metric')
     @patch('get_results.log_event')
@@ -61,42 +78,192 @@ class TestGetResults:
             mock_boto_client.return_value = mock_s3
             
             # Mock neither success nor failure files exist
-            with patch('get_results._check_s3_object_exists') as mock_check:
-                mock_check.return_value = {"exists": False}
+            with patch('get_results._try_get_object') as mock_get:
+                mock_get.return_value = {"exists": False}
                 
                 result = get_results(event, mock_lambda_context)
                 
                 assert result["success"] is True
                 assert result["data"]["status"] == "in_progress"
                 assert "check_interval_seconds" in result["data"]
+                # One GET per key answers the poll, with no HEAD requests
+                assert mock_get.call_count == 2
+                assert sorted(call.args[2] for call in mock_get.call_args_list) == [
+                    "async-inference-failures/test-output-123.out",
+                    "async-inference-output/test-output-123.out",
+                ]
+                mock_s3.head_object.assert_not_called()
 
     @patch('get_results.put_simple_metric')
     @patch('get_results.log_event')
-    def test_get_results_failed(self, mock_log_event, mock_put_metric, 
-                              mock_lambda_context, mock_environment_variables):
-        """Test results retrieval for failed prediction."""
+    def test_get_results_reuses_unchanged_results(self, mock_log_event, mock_put_metric, 
+                                                mock_lambda_context, mock_environment_variables):
+        """Test repeat polls reuse parsed results when S3 reports them unchanged."""
         event = {"output_id": "test-output-123"}
         
         with patch('get_results.boto3.client') as mock_boto_client:
             mock_s3 = Mock()
             mock_boto_client.return_value = mock_s3
             
-            # Mock success file doesn't exist, failure file exists
-            def mock_check_side_effect(client, bucket, key):
-                if "failure" in key:
-                    return {"exists": True, "last_modified": "2023-01-01T00:00:00Z"}
-                return {"exists": False}
+            with patch('get_results._try_get_object') as mock_get:
+                mock_get.return_value = {
+                    "exists": True,
+                    "etag": "abc123",
+                    "content_length": 29,
+                    "body": b'{"prediction": "result_data"}'
+                }
+                first = get_results(event, mock_lambda_context)
+                
+                mock_get.reset_mock()
+                mock_get.return_value = {"exists": True, "not_modified": True}
+                second = get_results(event, mock_lambda_context)
+                
+                assert second["data"]["results"] == first["data"]["results"]
+                mock_get.assert_any_call(
+                    mock_s3,
+                    "test-bucket",
+                    "async-inference-output/test-output-123.out",
+                    etag="abc123",
+                )
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_bucket_access_checked_once(self, mock_log_event, mock_put_metric, 
+                                                  mock_lambda_context, mock_environment_variables):
+        """Test bucket accessibility is probed once and re-probed after access errors."""
+        event = {"output_id": "test-output-123"}
+        
+        with patch('get_results.boto3.client') as mock_boto_client:
+            mock_s3 = Mock()
+            mock_s3.head_bucket.return_value = {}
+            mock_boto_client.return_value = mock_s3
+            
+            with patch('get_results._try_get_object') as mock_get:
+                mock_get.return_value = {"exists": False}
+                
+                get_results(event, mock_lambda_context)
+                get_results(event, mock_lambda_context)
+                assert mock_s3.head_bucket.call_count == 1
+                
+                mock_get.return_value = {"exists": False, "error": "ACCESS_DENIED"}
+                result = get_results(event, mock_lambda_context)
+                assert result["error_code"] == "ACCESS_DENIED"
+                
+                get_results(event, mock_lambda_context)
+                assert mock_s3.head_bucket.call_count == 2
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_lookups_run_concurrently(self, mock_log_event, mock_put_metric,
+                                                  mock_lambda_context, mock_environment_variables):
+        """Test the output and failure lookups are in flight at the same time."""
+        event = {"output_id": "test-output-123"}
+        started = {"output": threading.Event(), "failure": threading.Event()}
+        overlapped = []
+        
+        def mock_get_side_effect(client, bucket, key, etag=None, max_bytes=None):
+            own, other = ("failure", "output") if "failure" in key else ("output", "failure")
+            started[own].set()
+            # Sequential lookups would leave the other event unset until timeout
+            overlapped.append(started[other].wait(timeout=5))
+            return {"exists": False}
+        
+        with patch('get_results.boto3.client'), \
+                patch('get_results._try_get_object', side_effect=mock_get_side_effect):
+            result = get_results(event, mock_lambda_context)
+        
+        assert result["data"]["status"] == "in_progress"
+        assert overlapped == [True, True]
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_too_large(self, mock_log_event, mock_put_metric,
+                                   mock_lambda_context, mock_environment_variables):
+        """Test oversized results point the caller at S3 instead of being returned."""
+        event = {"output_id": "test-output-123"}
+        
+        with patch('get_results.boto3.client'), \
+                patch('get_results._try_get_object') as mock_get:
+            mock_get.return_value = {
+                "exists": True,
+                "too_large": True,
+                "content_length": MAX_RESULT_BYTES + 1,
+            }
+            result = get_results(event, mock_lambda_context)
+        
+        assert result["success"] is False
+        assert result["error_code"] == "RESULTS_TOO_LARGE"
+        assert result["details"]["s3_output_path"] == (
+            "s3://test-bucket/async-inference-output/test-output-123.out"
+        )
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_s3_client_cached(self, mock_log_event, mock_put_metric,
+                                          mock_lambda_context, mock_environment_variables):
+        """Test the S3 client is created once and reused across invocations."""
+        event = {"output_id": "test-output-123"}
+        
+        with patch('get_results.boto3.client') as mock_boto_client:
+            mock_boto_client.return_value = Mock()
+            
+            with patch('get_results._try_get_object', return_value={"exists": False}):
+                get_results(event, mock_lambda_context)
+                get_results(event, mock_lambda_context)
+            
+            mock_boto_client.assert_called_once()
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_failed(self, mock_log_event, mock_put_metric, 
+                              mock_lambda_context, mock_environment_variables, mock_s3_setup):
+        """Test results retrieval for failed prediction."""
+        s3_client, bucket_name = mock_s3_setup
+        s3_client.put_object(
+            Bucket=bucket_name,
+            Key="async-inference-failures/test-output-123.out",
+            Body=b'{"error": "Model failed"}',
+        )
+        event = {"output_id": "test-output-123"}
+        
+        with patch('get_results._try_get_object', wraps=get_results_module._try_get_object) as mock_get:
+            result = get_results(event, mock_lambda_context)
+            
+            assert result["success"] is False
+            assert result["error_code"] == "PREDICTION_FAILED"
+            assert result["details"]["status"] == "failed"
+            assert result["details"]["error_details"]["error"] == "Model failed"
+            # One timestamp is shared across the response and failure details
+            assert result["details"]["error_details"]["retrieval_info"]["retrieved_at"] == result["timestamp"]
+            mock_put_metric.assert_called_with("PredictionFailed", 1)
+            # Failure details come from the speculative GET, with no second request
+            assert mock_get.call_count == 2
+            assert sorted(call.args[2] for call in mock_get.call_args_list) == [
+                "async-inference-failures/test-output-123.out",
+                "async-inference-output/test-output-123.out",
+            ]
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_failed_repeat_poll_skips_s3(self, mock_log_event, mock_put_metric, 
+                                                   mock_lambda_context, mock_environment_variables):
+        """Test a known failure is answered without S3 lookups."""
+        event = {"output_id": "test-output-123"}
+        
+        def mock_get_side_effect(client, bucket, key, etag=None, max_bytes=None):
+            if "failure" in key:
+                return {"exists": True, "body": b'{"error": "Model failed"}'}
+            return {"exists": False}
+        
+        with patch('get_results.boto3.client'), \
+                patch('get_results._try_get_object', side_effect=mock_get_side_effect) as mock_get:
+            first = get_results(event, mock_lambda_context)
+            mock_get.reset_mock()
+            second = get_results(event, mock_lambda_context)
             
-            with patch('get_results._check_s3_object_exists', side_effect=mock_check_side_effect):
-                with patch('get_results._retrieve_s3_failure_details') as mock_retrieve_failure:
-                    mock_retrieve_failure.return_value = {"error": "Model failed"}
-                    
-                    result = get_results(event, mock_lambda_context)
-                    
-                    assert result["success"] is False
-                    assert result["error_code"] == "PREDICTION_FAILED"
-                    assert result["details"]["status"] == "failed"
-                    mock_put_metric.assert_called_with("PredictionFailed", 1)
+            assert second["error_code"] == "PREDICTION_FAILED"
+            assert second["details"]["error_details"] == first["details"]["error_details"]
+            mock_get.assert_not_called()
 
     @patch('get_results.put_simple_metric')
     @patch('get_results.log_event')
@@ -109,19 +276,35 @@ class TestGetResults:
             mock_s3 = Mock()
             mock_boto_client.return_value = mock_s3
             
-            with patch('get_results._check_s3_object_exists') as mock_check:
-                mock_check.return_value = {
+            with patch('get_results._try_get_object') as mock_get:
+                mock_get.return_value = {
                     "exists": True,
-                    "last_modified": "2023-01-01T00:00:00Z"
+                    "last_modified": "2023-01-01T00:00:00Z",
+                    "body": b'{"prediction": "result_data"}'
                 }
                 
-                with patch('get_results._retrieve_s3_results') as mock_retrieve:
-                    mock_retrieve.return_value = {"prediction": "result_data"}
-                    
-                    result = get_results(event, mock_lambda_context)
-                    
-                    assert result["success"] is True
-                    assert result["data"]["status"] == "completed"
+                result = get_results(event, mock_lambda_context)
+                
+                assert result["success"] is True
+                assert result["data"]["status"] == "completed"
+                mock_get.assert_any_call(
+                    mock_s3, "test-bucket", "async-inference-output/test-123.out", etag=None
+                )
+
+    @patch('get_results.put_simple_metric')
+    @patch('get_results.log_event')
+    def test_get_results_s3_path_invalid_bucket(self, mock_log_event, mock_put_metric, 
+                                              mock_lambda_context, mock_environment_variables):
+        """Test an invalid bucket name in an S3 path is rejected before any S3 call."""
+        event = {"output_id": "s3://Invalid_Bucket/async-inference-output/test-123.out"}
+        
+        with patch('get_results._try_get_object') as mock_get:
+            result = get_results(event, mock_lambda_context)
+            
+            assert result["success"] is False
+            assert result["error_code"] == "S3_CONFIGURATION_ERROR"
+            assert "invalid characters" in result["message"]
+            mock_get.assert_not_called()
 
     @patch('get_results.put_simple_metric')
     @patch('get_results.log_event')
@@ -193,205 +376,279 @@ class TestGetResults:
             assert result["error_code"] == "CLIENT_INITIALIZATION_ERROR"
 
 
-class TestCheckS3ObjectExists:
-    """Test S3 object existence checking."""
+class TestTryGetObjectResponses:
+    """Test S3 GET responses are classified from real client responses."""
 
-    def test_check_s3_object_exists_success(self):
-        """Test successful object existence check."""
+    def test_try_get_object_metadata(self, s3_stubber):
+        """Test object metadata is taken from the GET response."""
         from datetime import datetime, timezone
-        
-        mock_s3 = Mock()
-        mock_s3.head_object.return_value = {
-            "LastModified": datetime(2023, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-            "ContentLength": 1024,
-            "ETag": '"abc123"'
-        }
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
+
+        s3_stubber.add_response(
+            "get_object",
+            {
+                "Body": StreamingBody(io.BytesIO(b'{"a": 1}'), 8),
+                "LastModified": datetime(2023, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+                "ContentLength": 8,
+                "ETag": '"abc123"'
+            },
+            {"Bucket": "test-bucket", "Key": "test-key"},
+        )
+
+        result = _try_get_object(s3_stubber.client, "test-bucket", "test-key")
+
         assert result["exists"] is True
-        assert result["content_length"] == 1024
+        assert result["body"] == b'{"a": 1}'
+        assert result["content_length"] == 8
         assert result["etag"] == "abc123"
+        assert result["last_modified"] == "2023-01-01T00:00:00+00:00"
 
-    def test_check_s3_object_not_found(self):
-        """Test object not found."""
-        mock_s3 = Mock()
-        mock_s3.head_object.side_effect = ClientError(
-            {"Error": {"Code": "404"}}, "HeadObject"
-        )
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
-        assert result["exists"] is False
-        assert "error" not in result
+    def test_try_get_object_not_found(self, s3_stubber):
+        """Test a 404 is reported as not yet available."""
+        s3_stubber.add_client_error("get_object", service_error_code="404")
+
+        result = _try_get_object(s3_stubber.client, "test-bucket", "test-key")
 
-    def test_check_s3_object_access_denied(self):
-        """Test access denied error."""
-        mock_s3 = Mock()
-        mock_s3.head_object.side_effect = ClientError(
-            {"Error": {"Code": "403", "Message": "Access denied"}}, "HeadObject"
-        )
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
         assert result["exists"] is False
-        assert result["error"] == "ACCESS_DENIED"
+        assert "error" not in result
 
-    def test_check_s3_object_bucket_not_found(self):
+    def test_try_get_object_bucket_not_found(self, s3_stubber):
         """Test bucket not found error."""
-        mock_s3 = Mock()
-        mock_s3.head_object.side_effect = ClientError(
-            {"Error": {"Code": "NoSuchBucket"}}, "HeadObject"
-        )
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
+        s3_stubber.add_client_error("get_object", service_error_code="NoSuchBucket")
+
+        result = _try_get_object(s3_stubber.client, "test-bucket", "test-key")
+
         assert result["exists"] is False
         assert result["error"] == "BUCKET_NOT_FOUND"
 
-    def test_check_s3_object_service_unavailable(self):
+    def test_try_get_object_service_unavailable(self, s3_stubber):
         """Test service unavailable error."""
-        mock_s3 = Mock()
-        mock_s3.head_object.side_effect = ClientError(
-            {"Error": {"Code": "ServiceUnavailable"}}, "HeadObject"
-        )
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
+        s3_stubber.add_client_error("get_object", service_error_code="ServiceUnavailable")
+
+        result = _try_get_object(s3_stubber.client, "test-bucket", "test-key")
+
         assert result["exists"] is False
         assert result["error"] == "S3_SERVICE_UNAVAILABLE"
 
-    def test_check_s3_object_boto_error(self):
+    def test_try_get_object_boto_error(self):
         """Test BotoCore error."""
         mock_s3 = Mock()
-        mock_s3.head_object.side_effect = BotoCoreError()
-        
-        result = _check_s3_object_exists(mock_s3, "test-bucket", "test-key")
-        
+        mock_s3.get_object.side_effect = BotoCoreError()
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
+
         assert result["exists"] is False
         assert result["error"] == "BOTO_CONNECTION_ERROR"
 
 
-class TestRetrieveS3Results:
-    """Test S3 results retrieval."""
+class TestTryGetObject:
+    """Test single-request S3 object retrieval."""
 
-    def test_retrieve_s3_results_json_success(self):
-        """Test successful JSON results retrieval."""
+    def test_try_get_object_success(self):
+        """Test an existing object is returned with its body and metadata."""
         mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b'{"prediction": "result_data"}'
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
-        
-        assert result == {"prediction": "result_data"}
+        mock_body = Mock()
+        mock_body.read.return_value = gzip.compress(b'{"prediction": "result_data"}')
+        mock_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 42}
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
 
-    def test_retrieve_s3_results_text_content(self):
-        """Test text content results retrieval."""
+        assert result["exists"] is True
+        assert result["body"] == b'{"prediction": "result_data"}'
+        assert result["content_length"] == 42
+        mock_s3.head_object.assert_not_called()
+
+    def test_try_get_object_too_large(self):
+        """Test an oversized object is reported without reading its body."""
         mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b'Plain text result'
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
-        
-        assert result["raw_output"] == "Plain text result"
-        assert result["parsing_info"]["format"] == "text"
+        mock_body = Mock()
+        mock_s3.get_object.return_value = {
+            "Body": mock_body,
+            "ContentLength": MAX_RESULT_BYTES + 1,
+        }
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
+
+        assert result["exists"] is True
+        assert result["too_large"] is True
+        assert "body" not in result
+        mock_body.read.assert_not_called()
 
-    def test_retrieve_s3_results_empty_content(self):
-        """Test empty content results retrieval."""
+    @patch('get_results.MAX_RESULT_BYTES', 1024)
+    def test_try_get_object_decompressed_too_large(self):
+        """Test a small gzip body that expands past the limit is rejected."""
         mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b''
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
-        
-        assert result["raw_output"] == ""
-        assert "warning" in result
+        mock_body = Mock()
+        mock_body.read.return_value = gzip.compress(b"0" * 100_000)
+        mock_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 200}
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
 
-    def test_retrieve_s3_results_not_found(self):
-        """Test results retrieval when file not found."""
+        assert result["exists"] is True
+        assert result["too_large"] is True
+        assert "body" not in result
+
+    def test_try_get_object_bounded_read(self):
+        """Test max_bytes reads only a prefix of the body and closes the stream."""
+        mock_s3 = Mock()
+        mock_body = Mock()
+        mock_body.read.return_value = b"x" * 11
+        mock_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 1000}
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key", max_bytes=11)
+
+        assert result["body"] == b"x" * 11
+        assert result["content_length"] == 1000
+        mock_body.read.assert_called_once_with(11)
+        mock_body.close.assert_called_once()
+
+    def test_try_get_object_not_found(self):
+        """Test a missing object is reported as not yet available."""
         mock_s3 = Mock()
         mock_s3.get_object.side_effect = ClientError(
-            {"Error": {"Code": "404"}}, "GetObject"
+            {"Error": {"Code": "NoSuchKey"}}, "GetObject"
         )
-        
-        with pytest.raises(Exception, match="no longer exists"):
-            _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
 
-    def test_retrieve_s3_results_access_denied(self):
-        """Test results retrieval with access denied."""
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
+
+        assert result == {"exists": False}
+
+    def test_try_get_object_access_denied(self):
+        """Test access errors are classified like HEAD checks."""
         mock_s3 = Mock()
         mock_s3.get_object.side_effect = ClientError(
-            {"Error": {"Code": "403"}}, "GetObject"
+            {"Error": {"Code": "AccessDenied"}}, "GetObject"
         )
-        
-        with pytest.raises(Exception, match="Access denied"):
-            _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
 
-    def test_retrieve_s3_results_unicode_error(self):
-        """Test results retrieval with unicode decode error."""
+        result = _try_get_object(mock_s3, "test-bucket", "test-key")
+
+        assert result["exists"] is False
+        assert result["error"] == "ACCESS_DENIED"
+
+    def test_try_get_object_not_modified(self):
+        """Test a conditional GET of an unchanged object."""
         mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b'\xff\xfe'  # Invalid UTF-8
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
+        mock_s3.get_object.side_effect = ClientError(
+            {"Error": {"Code": "304"}}, "GetObject"
+        )
+
+        result = _try_get_object(mock_s3, "test-bucket", "test-key", etag="abc123")
+
+        assert result == {"exists": True, "not_modified": True}
+        mock_s3.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="test-key", IfNoneMatch='"abc123"'
+        )
+
+
+class TestParseS3Results:
+    """Test results object parsing."""
+
+    def test_parse_s3_results_json_success(self):
+        """Test JSON results are parsed from the body bytes."""
+        result = _parse_s3_results(b'{"prediction": "result_data"}', "test-bucket", "test-key")
+
+        assert result == {"prediction": "result_data"}
+
+    def test_parse_s3_results_text_content(self):
+        """Test text results are returned as raw output."""
+        result = _parse_s3_results(b'Plain text result', "test-bucket", "test-key")
+
+        assert result["raw_output"] == "Plain text result"
+        assert result["parsing_info"]["format"] == "text"
+
+    def test_parse_s3_results_empty_content(self):
+        """Test empty results are flagged with a warning."""
+        result = _parse_s3_results(b'', "test-bucket", "test-key")
+
+        assert result["raw_output"] == ""
+        assert "warning" in result
+
+    def test_parse_s3_results_unicode_error(self):
+        """Test results with invalid encoding are rejected."""
         with pytest.raises(Exception, match="invalid character encoding"):
-            _retrieve_s3_results(mock_s3, "test-bucket", "test-key")
+            _parse_s3_results(b'\xff\xfe', "test-bucket", "test-key")  # Invalid UTF-8
 
 
-class TestRetrieveS3FailureDetails:
-    """Test S3 failure details retrieval."""
+class TestParseS3FailureDetails:
+    """Test failure details parsing."""
+
+    def test_parse_s3_failure_details_json_success(self):
+        """Test JSON failure details are parsed with retrieval info."""
+        result = _parse_s3_failure_details(
+            b'{"error": "Model failed", "code": 500}', "test-bucket", "test-key"
+        )
 
-    def test_retrieve_s3_failure_details_json_success(self):
-        """Test successful JSON failure details retrieval."""
-        mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b'{"error": "Model failed", "code": 500}'
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_failure_details(mock_s3, "test-bucket", "test-key")
-        
         assert result["error"] == "Model failed"
         assert result["code"] == 500
-        assert "retrieval_info" in result
+        assert result["retrieval_info"]["content_length"] == 38
+
+    def test_parse_s3_failure_details_text_content(self):
+        """Test text failure details are returned as the error message."""
+        result = _parse_s3_failure_details(
+            b'Error: Model execution failed', "test-bucket", "test-key"
+        )
 
-    def test_retrieve_s3_failure_details_text_content(self):
-        """Test text content failure details retrieval."""
-        mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b'Error: Model execution failed'
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_failure_details(mock_s3, "test-bucket", "test-key")
-        
         assert result["error_message"] == "Error: Model execution failed"
         assert result["error_type"] == "text_format"
+        assert result["parsing_info"]["truncated"] is False
+        assert result["parsing_info"]["content_length"] == 29
+
+    def test_parse_s3_failure_details_long_text_truncated(self):
+        """Test long text failure details are returned as a bounded preview."""
+        result = _parse_s3_failure_details(
+            b"x" * (FAILURE_MESSAGE_MAX_CHARS + 1),
+            "test-bucket",
+            "test-key",
+            content_length=FAILURE_MESSAGE_MAX_CHARS + 10,
+        )
+
+        assert len(result["error_message"]) == FAILURE_MESSAGE_MAX_CHARS
+        assert result["parsing_info"]["content_length"] == FAILURE_MESSAGE_MAX_CHARS + 10
+        assert result["parsing_info"]["truncated"] is True
+
+    def test_parse_s3_failure_details_content_length_in_bytes(self):
+        """Test the reported size counts bytes, not decoded characters."""
+        result = _parse_s3_failure_details("Erreur é".encode(), "test-bucket", "test-key")
+
+        assert result["error_message"] == "Erreur é"
+        assert result["parsing_info"]["content_length"] == 9
+
+    def test_parse_s3_failure_details_truncated_json_as_text(self):
+        """Test a truncated JSON failure log falls back to a text preview."""
+        body = json.dumps({"error": "é" * FAILURE_MESSAGE_MAX_CHARS}).encode()
+
+        result = _parse_s3_failure_details(
+            body[:FAILURE_MESSAGE_MAX_CHARS + 1],
+            "test-bucket",
+            "test-key",
+            content_length=len(body),
+        )
+
+        assert result["error_type"] == "text_format"
+        assert result["error_message"].startswith('{"error": "')
+        assert result["parsing_info"]["truncated"] is True
+
+    def test_parse_s3_failure_details_empty_content(self):
+        """Test an empty failure log is reported as having no details."""
+        result = _parse_s3_failure_details(b'', "test-bucket", "test-key")
 
-    def test_retrieve_s3_failure_details_empty_content(self):
-        """Test empty failure details retrieval."""
-        mock_s3 = Mock()
-        mock_response = Mock()
-        mock_response.read.return_value = b''
-        mock_s3.get_object.return_value = {"Body": mock_response}
-        
-        result = _retrieve_s3_failure_details(mock_s3, "test-bucket", "test-key")
-        
         assert result["error_type"] == "empty_failure_log"
         assert "no error details available" in result["error_message"]
 
-    def test_retrieve_s3_failure_details_not_found(self):
-        """Test failure details retrieval when file not found."""
-        mock_s3 = Mock()
-        mock_s3.get_object.side_effect = ClientError(
-            {"Error": {"Code": "404"}}, "GetObject"
-        )
+
+class TestGetS3Settings:
+    """Test cached S3 settings."""
+
+    def test_get_s3_settings_reads_environment_once(self, mock_environment_variables, monkeypatch):
+        """Test settings are derived once and reused."""
+        monkeypatch.setenv("S3_OUTPUT_PREFIX", "async-inference-output/")
         
-        result = _retrieve_s3_failure_details(mock_s3, "test-bucket", "test-key")
+        settings = _get_s3_settings()
+        monkeypatch.setenv("S3_BUCKET_NAME", "other-bucket")
         
-        assert result["error_type"] == "failure_log_missing"
-        assert "no longer exists" in result["error_message"]
+        assert _get_s3_settings() is settings
+        assert settings["bucket"] == "test-bucket"
+        assert settings["output_prefix"] == "async-inference-output"
+        assert settings["validation"]["is_valid"] is True
 
 
 class TestValidateS3Configuration:
@@ -438,7 +695,7 @@ class TestValidateS3BucketAccess:
     def test_validate_s3_bucket_access_success(self):
         """Test successful bucket access validation."""
         mock_s3 = Mock()
-        mock_s3.list_objects_v2.return_value = {}
+        mock_s3.head_bucket.return_value = {}
         
         result = _validate_s3_bucket_access(mock_s3, "test-bucket")
         
@@ -447,8 +704,8 @@ class TestValidateS3BucketAccess:
     def test_validate_s3_bucket_access_not_found(self):
         """Test bucket not found."""
         mock_s3 = Mock()
-        mock_s3.list_objects_v2.side_effect = ClientError(
-            {"Error": {"Code": "NoSuchBucket"}}, "ListObjectsV2"
+        mock_s3.head_bucket.side_effect = ClientError(
+            {"Error": {"Code": "404"}}, "HeadBucket"
         )
         
         result = _validate_s3_bucket_access(mock_s3, "test-bucket")
@@ -456,6 +713,19 @@ class TestValidateS3BucketAccess:
         assert result["is_accessible"] is False
         assert result["error_code"] == "BUCKET_NOT_FOUND"
 
+    def test_validate_s3_bucket_access_denied(self):
+        """Test bucket access denied."""
+        mock_s3 = Mock()
+        mock_s3.head_bucket.side_effect = ClientError(
+            {"Error": {"Code": "403"}}, "HeadBucket"
+        )
+        
+        result = _validate_s3_bucket_access(mock_s3, "test-bucket")
+        
+        assert result["is_accessible"] is False
+        assert result["error_code"] == "BUCKET_ACCESS_DENIED"
+        mock_s3.list_objects_v2.assert_not_called()
+
 
 class TestResponseHelpers:
     """Test response helper functions."""
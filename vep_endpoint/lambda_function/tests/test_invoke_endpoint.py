@@ -6,20 +6,23 @@ import pytest
 import json
 from unittest.mock import Mock, patch, MagicMock
 from botocore.exceptions import ClientError, BotoCoreError
+import invoke_endpoint as invoke_endpoint_module
 from invoke_endpoint import (
     invoke_endpoint,
     _success_response,
     _error_response,
-    _estimate_completion_time
+    _estimate_completion_time,
+    _get_endpoint_settings
 )
 
 
 class TestInvokeEndpoint:
     """Test invoke_endpoint function."""
 
+    @patch('invoke_endpoint.put_batch_metrics')
     @patch('invoke_endpoint.put_simple_metric')
     @patch('invoke_endpoint.log_event')
-    def test_invoke_endpoint_success(self, mock_log_event, mock_put_metric, 
+    def test_invoke_endpoint_success(self, mock_log_event, mock_put_metric, mock_put_batch,
                                    mock_lambda_context, mock_environment_variables):
         """Test successful endpoint invocation."""
         event = {"sequence": "MKTVRQERLK"}
@@ -39,11 +42,17 @@ class TestInvokeEndpoint:
             result = invoke_endpoint(event, mock_lambda_context)
             
             assert result["success"] is True
-            assert "output_id" in result["data"]
+            assert result["data"]["output_id"] == "test-inference-123"
             assert "s3_output_path" in result["data"]
-            mock_put_metric.assert_any_call("InvocationSuccess", 1)
+            success_metrics = mock_put_batch.call_args[0][0]
+            assert ("InvocationSuccess", 1, "Count") in success_metrics
+            assert ("SequenceLength", 10, "Count") in success_metrics
             mock_s3.put_object.assert_called_once()
             mock_sagemaker.invoke_endpoint_async.assert_called_once()
+            mock_boto_client.assert_any_call(
+                "sagemaker-runtime", config=invoke_endpoint_module.CLIENT_CONFIG
+            )
+            mock_boto_client.assert_any_call("s3", config=invoke_endpoint_module.CLIENT_CONFIG)
 
     @patch('invoke_endpoint.put_simple_metric')
     @patch('invoke_endpoint.log_event')
@@ -276,6 +285,44 @@ class TestInvokeEndpoint:
             assert result["error_code"] == "CLIENT_INITIALIZATION_ERROR"
             mock_put_metric.assert_called_with("ClientError", 1)
 
+    @patch('invoke_endpoint.put_simple_metric')
+    @patch('invoke_endpoint.log_event')
+    def test_invoke_endpoint_reuses_clients(self, mock_log_event, mock_put_metric,
+                                            mock_lambda_context, mock_environment_variables):
+        """Test AWS clients are created once and reused across invocations."""
+        event = {"sequence": "MKTVRQERLK"}
+
+        with patch('invoke_endpoint.boto3.client') as mock_boto_client:
+            mock_s3 = Mock()
+            mock_sagemaker = Mock()
+            mock_boto_client.side_effect = [mock_sagemaker, mock_s3]
+            mock_sagemaker.invoke_endpoint_async.return_value = {
+                "InferenceId": "test-inference-123",
+                "OutputLocation": "s3://test-bucket/async-inference-output/test-inference-123.out"
+            }
+
+            invoke_endpoint(event, mock_lambda_context)
+            result = invoke_endpoint(event, mock_lambda_context)
+
+            assert result["success"] is True
+            assert mock_boto_client.call_count == 2
+            assert mock_sagemaker.invoke_endpoint_async.call_count == 2
+
+
+class TestGetEndpointSettings:
+    """Test cached endpoint settings."""
+
+    def test_get_endpoint_settings_reads_environment_once(self, mock_environment_variables, monkeypatch):
+        """Test settings are read once, with trailing slashes stripped from prefixes."""
+        monkeypatch.setenv("S3_INPUT_PREFIX", "async-inference-input/")
+
+        settings = _get_endpoint_settings()
+        monkeypatch.setenv("SAGEMAKER_ENDPOINT_NAME", "other-endpoint")
+
+        assert _get_endpoint_settings() is settings
+        assert settings["input_prefix"] == "async-inference-input"
+        assert settings["endpoint_name"] != "other-endpoint"
+
 
 class TestSuccessResponse:
     """Test success response creation."""
@@ -307,6 +354,12 @@ class TestSuccessResponse:
         assert response["data"] == {}
         assert response["success"] is True
 
+    def test_success_response_given_timestamp(self):
+        """Test success response reuses a caller-provided timestamp."""
+        response = _success_response({}, timestamp="2024-01-01T00:00:00+00:00")
+
+        assert response["timestamp"] == "2024-01-01T00:00:00+00:00"
+
 
 class TestErrorResponse:
     """Test error response creation."""
@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from lambda_function import (
     lambda_handler,
+    _TOOL_HANDLERS,
     _extract_tool_name,
     _error_response
 )
@@ -23,16 +24,13 @@ class TestLambdaHandler:
             "sequence": "MKTVRQERLK"
         }
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_invoke_module = Mock()
-            mock_invoke_module.invoke_endpoint.return_value = {"success": True, "data": {"output_id": "test-123"}}
-            mock_import.return_value = mock_invoke_module
+        mock_invoke_endpoint = Mock(return_value={"success": True, "data": {"output_id": "test-123"}})
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": mock_invoke_endpoint}):
             
             result = lambda_handler(event, mock_lambda_context)
             
             assert result["success"] is True
-            mock_invoke_module.invoke_endpoint.assert_called_once_with(event, mock_lambda_context)
+            mock_invoke_endpoint.assert_called_once_with(event, mock_lambda_context)
             mock_put_metric.assert_any_call("InvocationSuccess", 1)
             mock_log_event.assert_called()
 
@@ -45,16 +43,13 @@ class TestLambdaHandler:
             "output_id": "test-123"
         }
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_get_results_module = Mock()
-            mock_get_results_module.get_results.return_value = {"success": True, "data": {"status": "completed"}}
-            mock_import.return_value = mock_get_results_module
+        mock_get_results = Mock(return_value={"success": True, "data": {"status": "completed"}})
+        with patch.dict(_TOOL_HANDLERS, {"get_results": mock_get_results}):
             
             result = lambda_handler(event, mock_lambda_context)
             
             assert result["success"] is True
-            mock_get_results_module.get_results.assert_called_once_with(event, mock_lambda_context)
+            mock_get_results.assert_called_once_with(event, mock_lambda_context)
             mock_put_metric.assert_any_call("InvocationSuccess", 1)
 
     @patch('lambda_function.log_event')
@@ -94,16 +89,13 @@ class TestLambdaHandler:
             "sequence": "MKTVRQERLK"
         }
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_invoke_module = Mock()
-            mock_invoke_module.invoke_endpoint.return_value = {"success": True, "data": {"output_id": "test-123"}}
-            mock_import.return_value = mock_invoke_module
+        mock_invoke_endpoint = Mock(return_value={"success": True, "data": {"output_id": "test-123"}})
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": mock_invoke_endpoint}):
             
             result = lambda_handler(event, mock_lambda_context)
             
             assert result["success"] is True
-            mock_invoke_module.invoke_endpoint.assert_called_once_with(event, mock_lambda_context)
+            mock_invoke_endpoint.assert_called_once_with(event, mock_lambda_context)
 
     @patch('lambda_function.log_event')
     @patch('lambda_function.put_simple_metric')
@@ -114,11 +106,8 @@ class TestLambdaHandler:
             "sequence": "MKTVRQERLK"
         }
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_invoke_module = Mock()
-            mock_invoke_module.invoke_endpoint.return_value = {"success": False, "error_code": "VALIDATION_ERROR"}
-            mock_import.return_value = mock_invoke_module
+        mock_invoke_endpoint = Mock(return_value={"success": False, "error_code": "VALIDATION_ERROR"})
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": mock_invoke_endpoint}):
             
             result = lambda_handler(event, mock_lambda_context)
             
@@ -135,14 +124,7 @@ class TestLambdaHandler:
             "sequence": "MKTVRQERLK"
         }
         
-        # Mock the dynamic import to raise exception during import itself
-        def mock_import_side_effect(name, *args, **kwargs):
-            if name == "invoke_endpoint":
-                raise Exception("Unexpected error")
-            # Allow other imports to work normally
-            return __import__(name, *args, **kwargs)
-        
-        with patch('builtins.__import__', side_effect=mock_import_side_effect):
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": Mock(side_effect=Exception("Unexpected error"))}):
             result = lambda_handler(event, mock_lambda_context)
             
             assert result["success"] is False
@@ -158,11 +140,8 @@ class TestLambdaHandler:
         event = {"sequence": "MKTVRQERLK"}
         mock_extract.return_value = "invoke_endpoint"
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_invoke_module = Mock()
-            mock_invoke_module.invoke_endpoint.return_value = {"success": True, "data": {"output_id": "test-123"}}
-            mock_import.return_value = mock_invoke_module
+        mock_invoke_endpoint = Mock(return_value={"success": True, "data": {"output_id": "test-123"}})
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": mock_invoke_endpoint}):
             
             result = lambda_handler(event, mock_lambda_context)
             
@@ -178,11 +157,8 @@ class TestLambdaHandler:
             "sequence": "MKTVRQERLK"
         }
         
-        # Mock the dynamic import
-        with patch('builtins.__import__') as mock_import:
-            mock_invoke_module = Mock()
-            mock_invoke_module.invoke_endpoint.return_value = {"success": True, "data": {"output_id": "test-123"}}
-            mock_import.return_value = mock_invoke_module
+        mock_invoke_endpoint = Mock(return_value={"success": True, "data": {"output_id": "test-123"}})
+        with patch.dict(_TOOL_HANDLERS, {"invoke_endpoint": mock_invoke_endpoint}):
             
             lambda_handler(event, mock_lambda_context)
             
@@ -3,12 +3,14 @@ Unit tests for validators module.
 """
 
 import pytest
+from botocore.exceptions import ClientError
 from validators import (
     validate_amino_acid_sequence,
     validate_event_structure,
     create_validation_error_response,
     get_cleaned_sequence,
     get_arn_components,
+    get_client_error_details,
     ValidationResult
 )
 
@@ -287,4 +289,25 @@ class TestGetArnComponents:
         components = get_arn_components(None)
         
         assert components["is_valid_uuid"] is False
-        assert components["invocation_id"] == ""
\ No newline at end of file
+        assert components["invocation_id"] == ""
+
+
+class TestGetClientErrorDetails:
+    """Test ClientError code and message extraction."""
+
+    def test_code_and_message(self):
+        """Test the code and message are read from the error response."""
+        error = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "GetObject"
+        )
+        
+        assert get_client_error_details(error) == ("AccessDenied", "Access Denied")
+
+    def test_missing_error_details(self):
+        """Test defaults when the response carries no error details."""
+        error = ClientError({}, "GetObject")
+        
+        code, message = get_client_error_details(error)
+        
+        assert code == "Unknown"
+        assert message == str(error)
@@ -2,14 +2,17 @@
 Input validation utilities for Lambda function.
 
 This module provides validation functions for amino acid sequences,
-invocation ARNs, and other input parameters.
+invocation ARNs, and other input parameters, plus the botocore error
+helper shared by the tool modules.
 """
 
 import re
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 
+from botocore.exceptions import ClientError
+
 logger = logging.getLogger(__name__)
 
 
@@ -194,3 +197,17 @@ def get_arn_components(invocation_id: str) -> Dict[str, str]:
             ),
             "is_valid_uuid": False,
         }
+
+
+def get_client_error_details(error: ClientError) -> Tuple[str, str]:
+    """
+    Extract the error code and message from a botocore ClientError.
+
+    Args:
+        error: ClientError raised by an AWS client call
+
+    Returns:
+        Tuple of (error_code, error_message)
+    """
+    err = error.response.get("Error") or {}
+    return err.get("Code", "Unknown"), err.get("Message", str(error))
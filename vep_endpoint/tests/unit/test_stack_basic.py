@@ -119,6 +119,19 @@ class TestStackBasics:
         # Should have public access blocked
         assert "PublicAccessBlockConfiguration" in props
 
+    def test_async_inference_notifications_configured(self, template_from_default_stack):
+        """Test that async results are published to SNS and delivered to SQS."""
+        template = template_from_default_stack
+
+        template.resource_count_is("AWS::SNS::Topic", 2)
+        template.resource_count_is("AWS::SNS::Subscription", 2)
+        template.resource_count_is("AWS::SQS::Queue", 2)  # Notification queue + DLQ
+
+        config = list(template.find_resources("AWS::SageMaker::EndpointConfig").values())[0]
+        output_config = config["Properties"]["AsyncInferenceConfig"]["OutputConfig"]
+        assert "SuccessTopic" in output_config["NotificationConfig"]
+        assert "ErrorTopic" in output_config["NotificationConfig"]
+
     def test_lambda_function_has_correct_runtime(self, template_from_default_stack):
         """Test that Lambda function has correct runtime."""
         template = template_from_default_stack
@@ -19,6 +19,9 @@ from aws_cdk import (
     aws_s3_assets as s3_assets,
     aws_lambda as _lambda,
     aws_ssm as ssm,
+    aws_sns as sns,
+    aws_sns_subscriptions as sns_subscriptions,
+    aws_sqs as sqs,
 )
 from constructs import Construct
 import logging
@@ -252,6 +255,9 @@ class VEPEndpointStack(Stack):
         # Create S3 bucket and storage configuration
         self._create_s3_bucket_and_storage()
 
+        # Create SNS/SQS notifications for completed async inferences
+        self._create_inference_notifications()
+
         # Create SageMaker model with inference code
         self._create_sagemaker_model()
 
@@ -518,6 +524,59 @@ class VEPEndpointStack(Stack):
         )
         self.sagemaker_execution_role.attach_inline_policy(self.s3_access_policy)
 
+    def _create_inference_notifications(self) -> None:
+        """Create SNS topics for async inference results and an SQS queue subscribed to both."""
+        self.success_topic = sns.Topic(
+            self,
+            "AsyncInferenceSuccessTopic",
+            display_name="AMPLIFY async inference success",
+            # Enforce SSL for publishers and subscribers (CDK Nag AwsSolutions-SNS3)
+            enforce_ssl=True,
+        )
+        self.error_topic = sns.Topic(
+            self,
+            "AsyncInferenceErrorTopic",
+            display_name="AMPLIFY async inference error",
+            enforce_ssl=True,
+        )
+
+        # Undeliverable notifications are kept for inspection (CDK Nag AwsSolutions-SQS3)
+        self.notification_dlq = sqs.Queue(
+            self,
+            "AsyncInferenceNotificationDLQ",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            retention_period=Duration.days(14),
+        )
+
+        # Clients long-poll this queue and correlate messages by inferenceId
+        self.notification_queue = sqs.Queue(
+            self,
+            "AsyncInferenceNotificationQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            retention_period=Duration.days(1),
+            receive_message_wait_time=Duration.seconds(20),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=50, queue=self.notification_dlq
+            ),
+        )
+        for topic in (self.success_topic, self.error_topic):
+            topic.add_subscription(
+                sns_subscriptions.SqsSubscription(
+                    self.notification_queue, raw_message_delivery=True
+                )
+            )
+            topic.grant_publish(self.sagemaker_execution_role)
+
+        CfnOutput(
+            self,
+            "AsyncInferenceNotificationQueueUrl",
+            value=self.notification_queue.queue_url,
+            description="SQS queue receiving async inference success and error notifications",
+            export_name=f"{self.resource_prefix}-notification-queue-url",
+        )
+
     def get_storage_configuration(self) -> dict:
         """Return storage configuration details for async inference."""
         return {
@@ -632,8 +691,9 @@ class VEPEndpointStack(Stack):
                     "PYTHONUNBUFFERED": "1",
                     # Set model cache directory
                     "TRANSFORMERS_CACHE": "/tmp/transformers_cache",
-                    # Configure PyTorch settings for GPU inference
-                    "PYTORCH_CUDA_ALLOC_CONF": "max_split_size_mb:512",
+                    # Let the caching allocator grow segments instead of
+                    # fragmenting, so inference needs no empty_cache() calls
+                    "PYTORCH_CUDA_ALLOC_CONF": "expandable_segments:True",
                 },
             ),
             # Add tags for resource management
@@ -744,8 +804,11 @@ class VEPEndpointStack(Stack):
                 # Configure S3 output path for async inference results
                 output_config=sagemaker.CfnEndpointConfig.AsyncInferenceOutputConfigProperty(
                     s3_output_path=f"s3://{self.async_inference_bucket.bucket_name}/{self.output_prefix}",
-                    # Configure notification settings (optional)
-                    # notification_config can be added here for SNS notifications
+                    # Publish success/error events so clients can wait on SQS instead of polling S3
+                    notification_config=sagemaker.CfnEndpointConfig.AsyncInferenceNotificationConfigProperty(
+                        success_topic=self.success_topic.topic_arn,
+                        error_topic=self.error_topic.topic_arn,
+                    ),
                     s3_failure_path=f"s3://{self.async_inference_bucket.bucket_name}/async-inference-failures/",
                 ),
                 # Configure client settings for concurrent invocations